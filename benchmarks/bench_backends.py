@@ -0,0 +1,59 @@
+"""
+get_recommendations latency with the native rule backend against the
+pyswip/Prolog backend, on a synthetic knowledge base.
+
+Usage: python benchmarks/bench_backends.py [--destinations 20000] [--rounds 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import TravelExpertSystem
+from synthetic_kb import generate_kb
+
+
+def latencies(system, combos, rounds):
+    samples = []
+    for _ in range(rounds):
+        for budget, interest in combos:
+            start = time.perf_counter()
+            system.get_recommendations(budget, interest)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.quantiles(samples, n=100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinations", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = generate_kb(os.path.join(tmp, "kb.pl"), args.destinations, seed=args.seed)
+        system = TravelExpertSystem(kb, snapshot=False, backend='native')
+
+    budgets = sorted({s['B'] for s in system.prolog.query("budget_matches(B, _)")})
+    interests = sorted({s['I'] for s in system.prolog.query("interest_match(_, I)")})
+    combos = [(b, i) for b in budgets for i in interests]
+    system.get_recommendations(*combos[0])      # Build the native tables outside the timings
+
+    native = latencies(system, combos, args.rounds)
+    system.backend = 'prolog'
+    prolog = latencies(system, combos, args.rounds)
+
+    print(f"{args.destinations:,} destinations, {len(combos)} combinations x {args.rounds} rounds")
+    print(f"  prolog : p50 {prolog[49]:8.3f} ms   p99 {prolog[98]:8.3f} ms")
+    print(f"  native : p50 {native[49]:8.3f} ms   p99 {native[98]:8.3f} ms   "
+          f"({prolog[49] / native[49]:.1f}x at p50)")
+
+
+if __name__ == "__main__":
+    main()
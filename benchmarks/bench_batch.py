@@ -0,0 +1,50 @@
+"""
+Throughput of get_recommendations_many against a get_recommendations loop
+for a large batch of random traveller profiles.
+
+Usage: python benchmarks/bench_batch.py [--kb travel_kb.pl] [--profiles 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import TravelExpertSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kb", default="travel_kb.pl")
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    system = TravelExpertSystem(args.kb)
+    budgets = sorted({s['B'] for s in system.prolog.query("budget_matches(B, _)")})
+    interests = sorted({s['I'] for s in system.prolog.query("interest_match(_, I)")})
+    rng = random.Random(args.seed)
+    profiles = [(rng.choice(budgets), rng.choice(interests)) for _ in range(args.profiles)]
+
+    start = time.perf_counter()
+    looped = [system.get_recommendations(budget, interest) for budget, interest in profiles]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = system.get_recommendations_many(profiles)
+    batch_seconds = time.perf_counter() - start
+
+    if looped != batched:
+        sys.exit("get_recommendations_many returned different results than the loop")
+
+    print(f"{len(profiles):,} profiles, {len(set(profiles))} distinct")
+    print(f"  per-call loop : {loop_seconds:8.3f} s  ({len(profiles) / loop_seconds:12,.0f} profiles/s)")
+    print(f"  batch         : {batch_seconds:8.3f} s  ({len(profiles) / batch_seconds:12,.0f} profiles/s)")
+    print(f"  speedup       : {loop_seconds / batch_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cold-start time of TravelExpertSystem when consulting the .pl source
+against loading the compiled .qlf snapshot. Every run is a fresh process.
+
+Usage: python benchmarks/bench_kb_cache.py [--kb travel_kb.pl] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child process; prints the startup timings as JSON
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from main import TravelExpertSystem
+system = TravelExpertSystem(sys.argv[1], snapshot=sys.argv[2] == "1")
+timings = dict(system.timings, total=time.perf_counter() - start)
+print(json.dumps({"loaded_from": system.loaded_from, "timings": timings}))
+"""
+
+
+def cold_start(kb, snapshot):
+    """Start a new interpreter, load the KB and return its timings"""
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, kb, "1" if snapshot else "0"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kb", default="travel_kb.pl")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    kb = os.path.abspath(args.kb)
+    shutil.rmtree(os.path.join(os.path.dirname(kb), ".kb_cache"), ignore_errors=True)
+
+    source = [cold_start(kb, snapshot=False) for _ in range(args.runs)]
+    first = cold_start(kb, snapshot=True)
+    cached = [cold_start(kb, snapshot=True) for _ in range(args.runs)]
+    if any(run["loaded_from"] != "snapshot" for run in cached):
+        sys.exit("Snapshot was not used after the first run")
+
+    def median_ms(runs, key):
+        return statistics.median(run["timings"][key] for run in runs) * 1000
+
+    print(f"{args.kb}, median of {args.runs} cold starts")
+    print(f"  {'':18} {'consult':>10} {'total':>10}")
+    print(f"  {'source':18} {median_ms(source, 'consult'):8.1f} ms {median_ms(source, 'total'):8.1f} ms")
+    print(f"  {'snapshot (build)':18} {first['timings']['consult'] * 1000:8.1f} ms "
+          f"{first['timings']['total'] * 1000:8.1f} ms")
+    print(f"  {'snapshot':18} {median_ms(cached, 'consult'):8.1f} ms {median_ms(cached, 'total'):8.1f} ms")
+    print(f"  consult speedup  : {median_ms(source, 'consult') / median_ms(cached, 'consult'):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+get_recommendations throughput of EnginePool with 1, 2, 4, ... engines,
+against a single in-process TravelExpertSystem, on a synthetic KB.
+
+Usage: python benchmarks/bench_pool.py [--destinations 20000] [--calls 2000]
+           [--workers 1,2,4,8]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import EnginePool, TravelExpertSystem
+from synthetic_kb import budget_level_names, generate_kb, interest_names
+
+
+def throughput(engine, profiles, clients):
+    """Calls per second with `clients` threads calling concurrently"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        results = list(executor.map(lambda p: engine.get_recommendations(*p), profiles))
+    return len(profiles) / (time.perf_counter() - start), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinations", type=int, default=20_000)
+    parser.add_argument("--calls", type=int, default=2000)
+    default_workers = ",".join(str(n) for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1))
+    parser.add_argument("--workers", default=default_workers)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    budgets, interests = budget_level_names(3), interest_names(5)
+    profiles = [(rng.choice(budgets), rng.choice(interests)) for _ in range(args.calls)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = generate_kb(os.path.join(tmp, "kb.pl"), args.destinations, seed=args.seed)
+
+        single = TravelExpertSystem(kb, snapshot=False)
+        baseline, expected = throughput(single, profiles, clients=4)
+        print(f"{args.destinations:,} destinations, {args.calls:,} calls")
+        print(f"  in-process      : {baseline:10,.0f} calls/s")
+
+        for count in (int(n) for n in args.workers.split(",")):
+            with EnginePool(kb, workers=count, snapshot=False) as pool:
+                throughput(pool, profiles[:count * 4], clients=count)   # Warm every engine
+                rate, results = throughput(pool, profiles, clients=count * 2)
+            if results != expected:
+                sys.exit(f"Pool of {count} returned different results")
+            print(f"  pool x{count:<3}       : {rate:10,.0f} calls/s  ({rate / baseline:5.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Per-call overhead of the prepared destination_info/7 query against the
+original f-string query text.
+
+Usage: python benchmarks/bench_prepared_query.py [--kb travel_kb.pl] [--rounds 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import TravelExpertSystem
+
+
+def string_path(system, budget, interest):
+    """The query-text path get_recommendations used before PreparedQuery"""
+    query = f"destination_info(Dest, {budget}, {interest}, Visa, Docs, Season, MinBudget)"
+    return [{
+        'destination': solution['Dest'],
+        'visa_status': solution['Visa'],
+        'documents': solution['Docs'],
+        'best_season': solution['Season'],
+        'min_budget': solution['MinBudget']
+    } for solution in system.prolog.query(query)]
+
+
+def time_per_call(fn, system, combos, rounds):
+    """Mean microseconds per call over every combination, `rounds` times"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for budget, interest in combos:
+            fn(system, budget, interest)
+    return (time.perf_counter() - start) / (rounds * len(combos)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kb", default="travel_kb.pl")
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    system = TravelExpertSystem(args.kb)
+    budgets = sorted({s['B'] for s in system.prolog.query("budget_matches(B, _)")})
+    interests = sorted({s['I'] for s in system.prolog.query("interest_match(_, I)")})
+    combos = [(b, i) for b in budgets for i in interests]
+
+    prepared = lambda es, b, i: es.get_recommendations(b, i)
+    for budget, interest in combos:
+        if string_path(system, budget, interest) != prepared(system, budget, interest):
+            sys.exit(f"Result mismatch for ({budget}, {interest})")
+
+    # Warm both paths before timing
+    time_per_call(string_path, system, combos, 10)
+    time_per_call(prepared, system, combos, 10)
+
+    text_us = time_per_call(string_path, system, combos, args.rounds)
+    prepared_us = time_per_call(prepared, system, combos, args.rounds)
+
+    print(f"{len(combos)} combinations x {args.rounds} rounds")
+    print(f"  query text : {text_us:8.1f} us/call")
+    print(f"  prepared   : {prepared_us:8.1f} us/call")
+    print(f"  speedup    : {text_us / prepared_us:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Memory held by a long history of search results when each result is a
+fresh dict (as get_recommendations used to return) against the shared
+Destination records it returns now. Measured with tracemalloc.
+
+Usage: python benchmarks/bench_records.py [--destinations 5000] [--searches 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import TravelExpertSystem
+from synthetic_kb import generate_kb
+
+
+def held_bytes(build):
+    """Bytes still allocated after build() returns, with its result kept alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held, kept
+
+
+def as_dict(dest):
+    """A result in the old shape: a new dict with its own copy of every text field"""
+    return {
+        'destination': dest['destination'],
+        'visa_status': dest['visa_status'],
+        # Text decoded per solution, as each query used to produce it
+        'documents': ''.join(dest['documents']),
+        'best_season': ''.join(dest['best_season']),
+        'min_budget': dest['min_budget'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinations", type=int, default=5000)
+    parser.add_argument("--searches", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = generate_kb(os.path.join(tmp, "kb.pl"), args.destinations, seed=args.seed)
+        system = TravelExpertSystem(kb, snapshot=False)
+
+    budgets = sorted({s['B'] for s in system.prolog.query("budget_matches(B, _)")})
+    interests = sorted({s['I'] for s in system.prolog.query("interest_match(_, I)")})
+    rng = random.Random(args.seed)
+    searches = [(rng.choice(budgets), rng.choice(interests)) for _ in range(args.searches)]
+    # Warm the record pool so both histories measure only what they add
+    for budget in budgets:
+        for interest in interests:
+            system.get_recommendations(budget, interest)
+
+    record_bytes, records = held_bytes(
+        lambda: [system.get_recommendations(b, i) for b, i in searches])
+    dict_bytes, dicts = held_bytes(
+        lambda: [[as_dict(d) for d in system.get_recommendations(b, i)] for b, i in searches])
+
+    if records != dicts:
+        sys.exit("Record and dict histories differ")
+    results = sum(len(r) for r in records)
+    print(f"{args.searches:,} searches kept in memory, {results:,} results, "
+          f"{args.destinations:,} destinations")
+    print(f"  dicts   : {dict_bytes / 2**20:8.1f} MiB  ({dict_bytes / results:6.0f} B/result)")
+    print(f"  records : {record_bytes / 2**20:8.1f} MiB  ({record_bytes / results:6.0f} B/result)")
+    print(f"  saving  : {1 - record_bytes / dict_bytes:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
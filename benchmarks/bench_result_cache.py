@@ -0,0 +1,82 @@
+"""
+Warm-start latency with the persistent result cache: a first process fills
+the cache, then a fresh process (cold Prolog, cold memory, warm SQLite)
+is measured against its own second, in-memory-warm pass and against a
+process with no result cache at all.
+
+Usage: python benchmarks/bench_result_cache.py [--destinations 20000] [--rounds 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_kb import generate_kb
+
+
+def run_one(kb, cache, rounds):
+    """Child process: time every combination, first pass and later passes apart"""
+    from main import TravelExpertSystem
+    system = TravelExpertSystem(kb, snapshot=False, result_cache=cache or None)
+    budgets = sorted({s['B'] for s in system.prolog.query("budget_matches(B, _)")})
+    interests = sorted({s['I'] for s in system.prolog.query("interest_match(_, I)")})
+    combos = [(b, i) for b in budgets for i in interests]
+    passes = []
+    for _ in range(rounds):
+        samples = []
+        for budget, interest in combos:
+            start = time.perf_counter()
+            system.get_recommendations(budget, interest)
+            samples.append((time.perf_counter() - start) * 1000)
+        passes.append(samples)
+    later = [ms for samples in passes[1:] for ms in samples]
+    print(json.dumps({'first_ms': statistics.median(passes[0]),
+                      'warm_ms': statistics.median(later) if later else None,
+                      'cache': system.result_cache.stats() if system.result_cache else None}))
+
+
+def child(kb, cache, rounds):
+    command = [sys.executable, os.path.abspath(__file__), "--run-one", kb,
+               "--cache", cache, "--rounds", str(rounds)]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinations", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--run-one", metavar="KB", help=argparse.SUPPRESS)
+    parser.add_argument("--cache", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        run_one(args.run_one, args.cache, args.rounds)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = generate_kb(os.path.join(tmp, "kb.pl"), args.destinations, seed=args.seed)
+        cache = os.path.join(tmp, "results.sqlite")
+        uncached = child(kb, "", args.rounds)
+        child(kb, cache, 1)                         # Fill the cache, then exit
+        restarted = child(kb, cache, args.rounds)
+
+    print(f"{args.destinations:,} destinations, median get_recommendations latency")
+    print(f"  no cache, first pass           : {uncached['first_ms']:8.3f} ms")
+    print(f"  after restart, from SQLite     : {restarted['first_ms']:8.3f} ms")
+    print(f"  after restart, in-memory warm  : {restarted['warm_ms']:8.3f} ms")
+    print(f"  cache: {restarted['cache']['entries']} entries, "
+          f"{restarted['cache']['bytes'] / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
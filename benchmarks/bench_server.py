@@ -0,0 +1,117 @@
+"""
+Load generator for the headless server (main.py --serve): starts it on a
+synthetic KB and drives concurrent keep-alive clients against
+/recommendations, reporting latency percentiles and throughput.
+
+Usage: python benchmarks/bench_server.py [--destinations 20000] [--clients 32]
+           [--requests 5000] [--workers 0] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_kb import budget_level_names, generate_kb, interest_names
+
+
+def wait_for_health(port, timeout):
+    """Block until the server answers /health"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as r:
+                return json.load(r)
+        except OSError:
+            time.sleep(0.2)
+    sys.exit(f"Server did not come up on port {port} within {timeout:.0f} s")
+
+
+async def client(port, paths, samples):
+    """One keep-alive connection sending its paths one after another"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode())
+            await writer.drain()
+            status = (await reader.readline()).split()[1]
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            if status != b"200":
+                raise RuntimeError(f"{path} answered {status.decode()}")
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        writer.close()
+
+
+async def drive(port, paths, clients):
+    samples = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, paths[i::clients], samples) for i in range(clients)))
+    return samples, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinations", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="engine processes behind the server (0 = one in-process engine)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    budgets, interests = budget_level_names(3), interest_names(5)
+    paths = []
+    for _ in range(args.requests):
+        if rng.random() < 0.25:
+            paths.append(f"/recommendations?amount={rng.randrange(500, 3000, 50)}"
+                         f"&interest={rng.choice(interests)}")
+        else:
+            paths.append(f"/recommendations?budget={rng.choice(budgets)}"
+                         f"&interest={rng.choice(interests)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = generate_kb(os.path.join(tmp, "kb.pl"), args.destinations, seed=args.seed)
+        command = [sys.executable, os.path.join(ROOT, "main.py"), "--kb", kb, "--no-snapshot",
+                   "--serve", f"127.0.0.1:{args.port}"]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+        try:
+            wait_for_health(args.port, timeout=120)
+            # First pass fills the response cache; the second is what a warm server sees
+            cold, cold_seconds = asyncio.run(drive(args.port, paths, args.clients))
+            warm, warm_seconds = asyncio.run(drive(args.port, paths, args.clients))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"{args.destinations:,} destinations, {args.requests:,} requests, "
+          f"{args.clients} clients, {args.workers or 1} engine(s)")
+    for label, samples, seconds in (("cold", cold, cold_seconds), ("warm", warm, warm_seconds)):
+        cuts = statistics.quantiles(samples, n=100)
+        print(f"  {label} : p50 {cuts[49]:7.3f} ms   p99 {cuts[98]:7.3f} ms   "
+              f"{len(samples) / seconds:9,.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
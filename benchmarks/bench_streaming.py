@@ -0,0 +1,60 @@
+"""
+Time to first result of iter_recommendations against the time
+get_recommendations takes to return the whole list, on a synthetic KB.
+
+Usage: python benchmarks/bench_streaming.py [--destinations 50000] [--rounds 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import TravelExpertSystem
+from synthetic_kb import generate_kb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinations", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = generate_kb(os.path.join(tmp, "kb.pl"), args.destinations, seed=args.seed)
+        system = TravelExpertSystem(kb, snapshot=False)
+
+    budgets = sorted({s['B'] for s in system.prolog.query("budget_matches(B, _)")})
+    interests = sorted({s['I'] for s in system.prolog.query("interest_match(_, I)")})
+    combos = [(b, i) for b in budgets for i in interests]
+
+    first_ms, full_ms, sizes = [], [], []
+    for _ in range(args.rounds):
+        for budget, interest in combos:
+            start = time.perf_counter()
+            stream = system.iter_recommendations(budget, interest)
+            first = next(stream, None)
+            first_ms.append((time.perf_counter() - start) * 1000)
+            stream.close()   # Early exit must close the Prolog query cleanly
+
+            start = time.perf_counter()
+            results = system.get_recommendations(budget, interest)
+            full_ms.append((time.perf_counter() - start) * 1000)
+            sizes.append(len(results))
+            if results and first != results[0]:
+                sys.exit(f"First streamed result differs for ({budget}, {interest})")
+
+    print(f"{args.destinations:,} destinations, {len(combos)} combinations x {args.rounds} rounds, "
+          f"{statistics.mean(sizes):,.0f} results on average")
+    print(f"  first result (stream) : p50 {statistics.median(first_ms):8.3f} ms   max {max(first_ms):8.3f} ms")
+    print(f"  full list             : p50 {statistics.median(full_ms):8.3f} ms   max {max(full_ms):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Multi-origin serving from one engine: load time and fact memory per origin,
+cold (first query, loads the origin) and warm query latency, and LRU
+evictions when the origins do not all fit under the memory cap.
+
+Usage: python benchmarks/bench_tenants.py [--origins 8] [--destinations 5000]
+           [--memory-cap-mb 16] [--rounds 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import MultiOriginSystem
+from synthetic_kb import generate_kb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--origins", type=int, default=8)
+    parser.add_argument("--destinations", type=int, default=5000)
+    parser.add_argument("--memory-cap-mb", type=float, default=16)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        origins = {f"origin_{i}": generate_kb(os.path.join(tmp, f"origin_{i}.pl"),
+                                              args.destinations, seed=args.seed + i)
+                   for i in range(args.origins)}
+        start = time.perf_counter()
+        system = MultiOriginSystem(origins, os.path.join(ROOT, "travel_kb.pl"), snapshot=False,
+                                   memory_cap_mb=args.memory_cap_mb)
+        startup_ms = (time.perf_counter() - start) * 1000
+
+        cold, warm, sizes = [], [], []
+        for _ in range(args.rounds):
+            for origin in origins:
+                loaded = origin in system.stats()['loaded']
+                start = time.perf_counter()
+                system.get_recommendations(origin, "high", "beach")
+                elapsed = (time.perf_counter() - start) * 1000
+                (warm if loaded else cold).append(elapsed)
+                start = time.perf_counter()
+                system.get_recommendations(origin, "medium", "city")
+                warm.append((time.perf_counter() - start) * 1000)
+                sizes.append(system.stats()['loaded'][origin])
+
+    stats = system.stats()
+    print(f"{args.origins} origins x {args.destinations:,} destinations, "
+          f"cap {args.memory_cap_mb:g} MiB, engine started in {startup_ms:.0f} ms")
+    print(f"  facts per origin  : {statistics.mean(sizes) / 2**20:8.2f} MiB")
+    print(f"  cold query (load) : p50 {statistics.median(cold):8.1f} ms   ({len(cold)} loads)")
+    print(f"  warm query        : p50 {statistics.median(warm):8.3f} ms")
+    print(f"  evictions         : {stats['evictions']}, "
+          f"{len(stats['loaded'])} origins loaded ({stats['bytes'] / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+search_text latency on a synthetic knowledge base, against scanning every
+destination's documents and season text for the same terms.
+
+Usage: python benchmarks/bench_text_search.py [--destinations 20000] [--calls 500]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import TextIndex, TravelExpertSystem, _tokens
+from synthetic_kb import generate_kb
+
+QUERIES = ["bank statement", "-return", "passport -insurance", "hotel booking -ticket",
+           "photo", "march", "insurance -bank -photo"]
+
+
+def scan(rows, query):
+    """The same query answered by tokenizing every row"""
+    required, excluded = TextIndex.parse(query)
+    results = []
+    for row in rows:
+        terms = set(_tokens(row['documents'])) | set(_tokens(row['best_season']))
+        if all(t in terms for t in required) and not any(t in terms for t in excluded):
+            results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinations", type=int, default=20_000)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = generate_kb(os.path.join(tmp, "kb.pl"), args.destinations, seed=args.seed)
+        system = TravelExpertSystem(kb, snapshot=False)
+        index = system._current_text_index()
+
+    for query in QUERIES:
+        if system.search_text(query) != scan(index.rows, query):
+            sys.exit(f"Index and scan disagree on {query!r}")
+
+    rng = random.Random(args.seed)
+    queries = [rng.choice(QUERIES) for _ in range(args.calls)]
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        system.search_text(query)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for query in queries[:10]:
+        scan(index.rows, query)
+    scan_ms = (time.perf_counter() - start) * 100
+
+    cuts = statistics.quantiles(samples, n=100)
+    print(f"{len(index):,} destinations, {args.calls} queries "
+          f"(index built in {index.build_seconds * 1000:.1f} ms)")
+    print(f"  inverted index : p50 {cuts[49]:7.3f} ms   p99 {cuts[98]:7.3f} ms")
+    print(f"  full scan      : {scan_ms:7.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
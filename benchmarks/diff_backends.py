@@ -0,0 +1,97 @@
+"""
+Differential check of the native rule backend against Prolog: every
+budget/interest combination of destination_info/7, plus visa_difficulty/2,
+in_budget_range/2 and visa_info/4 for every destination, must give the same
+solutions in the same order. Exits non-zero on the first mismatch.
+
+Each knowledge base is checked in a fresh process, so clauses left over
+from one KB can never hide a difference in the next.
+
+Usage: python benchmarks/diff_backends.py [--kb travel_kb.pl] [--destinations 100,5000]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_kb import generate_kb
+
+
+def check(system):
+    """Compare both backends on one loaded KB; returns the number of queries compared"""
+    native = system._current_native()
+    if native is None:
+        sys.exit("Native backend unavailable: the KB rules differ from NativeRules.RULES")
+    prolog = system.prolog
+    budgets = sorted({s['B'] for s in prolog.query("budget_matches(B, _)")})
+    interests = sorted({s['I'] for s in prolog.query("interest_match(_, I)")}) + ["no_such_interest"]
+    dests = sorted({s['D'] for s in prolog.query("visa_status(D, _)")}) + ["no_such_place"]
+    compared = 0
+
+    def same(what, expected, actual):
+        nonlocal compared
+        compared += 1
+        if expected != actual:
+            sys.exit(f"Mismatch in {what}:\n  prolog: {expected}\n  native: {actual}")
+
+    for budget in budgets + ["no_such_budget"]:
+        for interest in interests:
+            same(f"destination_info(_, {budget}, {interest}, ...)",
+                 [tuple(d.values()) for d in system._solutions(budget, interest)],
+                 [tuple(d.values()) for d in native.destination_info(budget, interest)])
+            same(f"can_visit(_, {budget}, {interest})",
+                 [s['D'] for s in prolog.query(f"can_visit(D, {budget}, {interest})")],
+                 list(native.can_visit(budget, interest)))
+
+    for dest in dests:
+        same(f"visa_difficulty({dest}, _)",
+             [s['X'] for s in prolog.query(f"visa_difficulty({dest}, X)")],
+             native.visa_difficulty(dest))
+        same(f"visa_info({dest}, ...)",
+             [(s['S'], s['X'], s['D']) for s in prolog.query(f"visa_info({dest}, S, X, D)")],
+             list(native.visa_info(dest)))
+        for amount in (0, 499, 500, 1000, 1500, 2500, 10_000):
+            same(f"in_budget_range({dest}, {amount})",
+                 bool(list(prolog.query(f"in_budget_range({dest}, {amount})"))),
+                 native.in_budget_range(dest, amount))
+    return compared
+
+
+def check_one(kb):
+    """Child process: load one KB with both backends and compare them"""
+    from main import TravelExpertSystem
+    system = TravelExpertSystem(kb, snapshot=False, backend='native')
+    print(f"✓ {os.path.basename(kb)}: {check(system):,} queries identical")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kb", default=os.path.join(ROOT, "travel_kb.pl"))
+    parser.add_argument("--destinations", default="100,5000",
+                        help="comma-separated synthetic KB sizes to check as well")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--check-one", metavar="KB", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.check_one:
+        check_one(args.check_one)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kbs = [args.kb] + [generate_kb(os.path.join(tmp, f"kb_{n}.pl"), int(n), seed=args.seed)
+                           for n in args.destinations.split(",") if n]
+        for kb in kbs:
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), "--check-one", kb],
+                                    cwd=ROOT)
+            if result.returncode:
+                sys.exit(result.returncode)
+
+
+if __name__ == "__main__":
+    main()
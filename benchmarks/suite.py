@@ -0,0 +1,201 @@
+"""
+Scaling benchmark over synthetic knowledge bases: load time,
+get_recommendations latency percentiles, memory held by the result lists,
+and destination card render time. Writes one JSON document.
+
+Each knowledge base size is measured in a fresh process, since a process
+holds a single Prolog engine. Card rendering needs an X display; on a
+server run the suite under xvfb-run, or pass --skip-render.
+
+Usage: python benchmarks/suite.py [--destinations 100,1000,10000]
+           [--interests 5] [--budget-levels 3] [--repeat 20]
+           [--output bench_results.json] [--skip-render]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_kb import generate_kb
+
+
+def percentiles(samples_ms):
+    """p50/p90/p99/max summary of a list of millisecond timings"""
+    # quantiles() needs two points; a single sample is its own percentile
+    cuts = statistics.quantiles(samples_ms * 2 if len(samples_ms) < 2 else samples_ms,
+                                n=100, method='inclusive')
+    return {
+        'count': len(samples_ms),
+        'mean_ms': statistics.fmean(samples_ms),
+        'p50_ms': cuts[49],
+        'p90_ms': cuts[89],
+        'p99_ms': cuts[98],
+        'max_ms': max(samples_ms),
+    }
+
+
+def measure_load(kb):
+    """Time TravelExpertSystem construction, broken down by startup phase"""
+    from main import TravelExpertSystem
+    start = time.perf_counter()
+    system = TravelExpertSystem(kb, snapshot=False)
+    total = time.perf_counter() - start
+    phases = {f"{name}_ms": seconds * 1000 for name, seconds in system.timings.items()}
+    return system, dict(phases, total_ms=total * 1000)
+
+
+def measure_latency(system, combos, repeat):
+    """Latency of every budget/interest combination, `repeat` times each"""
+    samples = []
+    for _ in range(repeat):
+        for budget, interest in combos:
+            start = time.perf_counter()
+            system.get_recommendations(budget, interest)
+            samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def measure_memory(system, combos):
+    """Bytes allocated by the result lists of every combination, kept alive together"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = [system.get_recommendations(budget, interest) for budget, interest in combos]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    rows = sum(len(r) for r in results)
+    return {
+        'result_lists': len(results),
+        'results': rows,
+        'bytes': held,
+        'bytes_per_result': held / rows if rows else 0,
+    }
+
+
+def measure_render(system, combos, cards):
+    """Time _create_destination_card for up to `cards` results, without showing a window"""
+    if not os.environ.get('DISPLAY'):
+        return {'skipped': 'no DISPLAY (run under xvfb-run)'}
+
+    import main
+    main._import_gui()
+    dests = []
+    for budget, interest in combos:
+        dests.extend(system.get_recommendations(budget, interest))
+        if len(dests) >= cards:
+            break
+    dests = dests[:cards]
+    if not dests:
+        return {'skipped': 'no results to render'}
+
+    # Only the parts of TravelGUI that card building touches
+    gui = main.TravelGUI.__new__(main.TravelGUI)
+    gui.root = main.ctk.CTk()
+    gui.root.withdraw()
+    parent = main.ctk.CTkFrame(gui.root)
+    samples = []
+    try:
+        for dest in dests:
+            start = time.perf_counter()
+            card = gui._create_destination_card(parent, dest)
+            gui.root.update_idletasks()
+            samples.append((time.perf_counter() - start) * 1000)
+            card.frame.destroy()
+    finally:
+        gui.root.destroy()
+    return percentiles(samples)
+
+
+def run_one(args):
+    """Child process: measure one knowledge base and print the JSON record"""
+    system, load = measure_load(args.run_one)
+    budgets = sorted({s['B'] for s in system.prolog.query("budget_matches(B, _)")})
+    interests = sorted({s['I'] for s in system.prolog.query("interest_match(_, I)")})
+    combos = [(b, i) for b in budgets for i in interests]
+
+    record = {
+        'load': load,
+        'combinations': len(combos),
+        'latency': measure_latency(system, combos, args.repeat),
+        'memory': measure_memory(system, combos),
+    }
+    if not args.skip_render:
+        record['render'] = measure_render(system, combos, args.render_cards)
+    print(json.dumps(record))
+
+
+def git_commit():
+    """HEAD of the checkout being measured, if it is a git repository"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinations", default="100,1000,10000",
+                        help="comma-separated knowledge base sizes")
+    parser.add_argument("--interests", type=int, default=5)
+    parser.add_argument("--budget-levels", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="latency samples per budget/interest combination")
+    parser.add_argument("--render-cards", type=int, default=50)
+    parser.add_argument("--skip-render", action="store_true")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--run-one", metavar="KB", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        run_one(args)
+        return
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'runs': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(n) for n in args.destinations.split(",")):
+            kb = generate_kb(os.path.join(tmp, f"kb_{size}.pl"), size,
+                             args.interests, args.budget_levels, args.seed)
+            command = [sys.executable, os.path.abspath(__file__), "--run-one", kb,
+                       "--repeat", str(args.repeat), "--render-cards", str(args.render_cards)]
+            if args.skip_render:
+                command.append("--skip-render")
+            output = subprocess.run(command, cwd=ROOT, capture_output=True,
+                                    text=True, check=True).stdout
+            record = json.loads(output.strip().splitlines()[-1])
+            record['params'] = {'destinations': size, 'interests': args.interests,
+                                'budget_levels': args.budget_levels, 'seed': args.seed}
+            report['runs'].append(record)
+
+            latency = record['latency']
+            print(f"{size:>8,} destinations: load {record['load']['total_ms']:8.1f} ms | "
+                  f"p50 {latency['p50_ms']:7.3f} ms | p99 {latency['p99_ms']:7.3f} ms | "
+                  f"results {record['memory']['bytes'] / 1024:9.1f} KiB")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
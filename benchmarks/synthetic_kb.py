@@ -0,0 +1,111 @@
+"""
+Generate a knowledge base shaped like travel_kb.pl with any number of
+destinations, interests and budget levels. The fact tables are random (but
+seeded); the rules are copied from travel_kb.pl so they never drift apart.
+
+Usage: python benchmarks/synthetic_kb.py OUTPUT [--destinations 1000]
+           [--interests 5] [--budget-levels 3] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INTERESTS = ['beach', 'nature', 'history', 'shopping', 'city']
+BUDGET_LEVELS = ['low', 'medium', 'high']
+VISA_STATUSES = ['visa_free', 'visa_on_arrival', 'e_visa', 'visa_required']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+DOCUMENTS = ['Valid passport (6 months validity)', 'Return ticket', 'Hotel booking confirmation',
+             'Bank statements (6 months)', 'Employment letter', 'Travel insurance',
+             '2 passport photos', 'Travel itinerary', 'Accommodation proof']
+
+
+def interest_names(count):
+    """The real interests first, then interest_6, interest_7, ..."""
+    return (INTERESTS + [f"interest_{i}" for i in range(len(INTERESTS) + 1, count + 1)])[:count]
+
+
+def budget_level_names(count):
+    """low/medium/high when they are enough, otherwise level_1 .. level_N"""
+    if count <= len(BUDGET_LEVELS):
+        return BUDGET_LEVELS[:count]
+    return [f"level_{i}" for i in range(1, count + 1)]
+
+
+def rules_section(kb_file=os.path.join(ROOT, "travel_kb.pl")):
+    """Everything in travel_kb.pl from the can_visit/3 rules onwards"""
+    with open(kb_file, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    for i, line in enumerate(lines):
+        if line.startswith("% RULES: CAN VISIT"):
+            return "\n".join(lines[i - 1:]) + "\n"
+    raise ValueError(f"No '% RULES: CAN VISIT' section in {kb_file}")
+
+
+def quote(text):
+    """Text as a quoted Prolog atom"""
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def generate_kb(path, destinations=1000, interests=5, budget_levels=3, seed=42):
+    """Write a synthetic knowledge base to `path` and return its path"""
+    rng = random.Random(seed)
+    interest_list = interest_names(interests)
+    levels = budget_level_names(budget_levels)
+    names = [f"dest_{i:06d}" for i in range(1, destinations + 1)]
+    tables = {name: [] for name in ('visa_status', 'budget_level', 'interest_match',
+                                    'min_budget', 'visa_documents', 'best_season')}
+
+    for dest in names:
+        level = rng.randrange(len(levels))
+        tables['visa_status'].append(f"visa_status({dest}, {rng.choice(VISA_STATUSES)}).")
+        tables['budget_level'].append(f"budget_level({dest}, {levels[level]}).")
+        for interest in rng.sample(interest_list, rng.randint(1, min(3, len(interest_list)))):
+            tables['interest_match'].append(f"interest_match({dest}, {interest}).")
+        tables['min_budget'].append(f"min_budget({dest}, {500 + 700 * level + rng.randrange(0, 400, 50)}).")
+        docs = ", ".join(rng.sample(DOCUMENTS, rng.randint(2, 5)))
+        tables['visa_documents'].append(f"visa_documents({dest}, {quote(docs)}).")
+        first = rng.randrange(12)
+        season = f"{MONTHS[first]} to {MONTHS[(first + rng.randint(2, 6)) % 12]} (Synthetic)"
+        tables['best_season'].append(f"best_season({dest}, {quote(season)}).")
+
+    parts = [
+        f"% Synthetic knowledge base: {destinations} destinations, "
+        f"{interests} interests, {budget_levels} budget levels (seed {seed})",
+        ":- dynamic visa_status/2, budget_level/2, interest_match/2,",
+        "           min_budget/2, visa_documents/2, best_season/2.",
+        ":- module_transparent can_visit/3, destination_info/7, visa_difficulty/2,",
+        "                      in_budget_range/2.",
+        "",
+    ]
+    for facts in tables.values():
+        parts.extend(facts)
+        parts.append("")
+    # Same shape as the real budget_matches/2: a budget covers its level and every cheaper one
+    for i, user_level in enumerate(levels):
+        parts.extend(f"budget_matches({user_level}, {dest_level})." for dest_level in levels[:i + 1])
+    parts.append("")
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(parts) + "\n" + rules_section())
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output")
+    parser.add_argument("--destinations", type=int, default=1000)
+    parser.add_argument("--interests", type=int, default=5)
+    parser.add_argument("--budget-levels", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generate_kb(args.output, args.destinations, args.interests, args.budget_levels, args.seed)
+    print(f"✓ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
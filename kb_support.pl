@@ -0,0 +1,123 @@
+% ============================================================================
+% PAKISTANI TRAVEL & VISA EXPERT SYSTEM - APPLICATION SUPPORT
+% ============================================================================
+% Predicates main.py relies on, whatever knowledge base --kb points at.
+% TravelExpertSystem consults this file before the KB, so travel_kb.pl
+% holds only facts and domain rules and can be edited or swapped freely.
+% ============================================================================
+
+% Module-transparent like the KB's rules, so Origin:visa_info(...) reads the
+% fact tables of that origin's module
+:- module_transparent visa_info/4.
+
+% ============================================================================
+% RULES: VISA LOOKUP
+% ============================================================================
+% visa_info(Destination, Status, Difficulty, Documents)
+% Everything a traveller needs to know about the visa for one destination
+
+visa_info(Dest, Status, Difficulty, Docs) :-
+    visa_status(Dest, Status),
+    visa_difficulty(Dest, Difficulty),
+    visa_documents(Dest, Docs).
+
+
+% ============================================================================
+% RULES: BATCH QUERIES
+% ============================================================================
+% destination_info_batch(Budgets, Interests, Answers)
+% Answers holds one list per Budget/Interest pair, each containing
+% info(Dest, Visa, Docs, Season, MinBudget) for every destination_info/7 match
+
+destination_info_batch(Budgets, Interests, Answers) :-
+    maplist(profile_answers, Budgets, Interests, Answers).
+
+profile_answers(Budget, Interest, Rows) :-
+    findall(info(Dest, Visa, Docs, Season, MinBudget),
+            destination_info(Dest, Budget, Interest, Visa, Docs, Season, MinBudget),
+            Rows).
+
+
+% ============================================================================
+% RULES: HOT RELOAD
+% ============================================================================
+% kb_apply_changes(Retract, Assert)
+% Each change is [Predicate, Arg1, Arg2] for one of the dynamic fact tables;
+% the Retract facts are removed first, then the Assert facts are appended
+
+kb_apply_changes(Retract, Assert) :-
+    forall(member([P, A, B], Retract), (Fact =.. [P, A, B], ignore(retract(Fact)))),
+    forall(member([P, A, B], Assert), (Fact =.. [P, A, B], assertz(Fact))).
+
+
+% ============================================================================
+% RULES: MULTI-TENANT
+% ============================================================================
+% Each origin country's facts live in a module of their own; the KB's rules
+% and budget_matches/2 are shared, and resolve the facts in that module
+% tenant_load(Tenant, File, Loaded, Skipped), tenant_unload(Tenant),
+% tenant_size(Tenant, Bytes)
+
+fact_table(visa_status).
+fact_table(budget_level).
+fact_table(interest_match).
+fact_table(min_budget).
+fact_table(visa_documents).
+fact_table(best_season).
+
+% File is read with the Prolog reader, so every fact consult/1 would see is
+% loaded; other clauses are skipped, and Skipped counts the fact-table
+% clauses among them (rules, non-ground facts), which a tenant cannot hold.
+% Every table is declared in the tenant module, so an empty one never falls
+% through to the default facts in user
+tenant_load(Tenant, File, Loaded, Skipped) :-
+    forall(fact_table(P), dynamic(Tenant:P/2)),
+    catch(setup_call_cleanup(open(File, read, In, [encoding(utf8)]),
+                             tenant_read(In, Tenant, 0-0, Loaded-Skipped),
+                             close(In)),
+          Error,
+          ( tenant_unload(Tenant), throw(Error) )).
+
+tenant_read(In, Tenant, Loaded0-Skipped0, Counts) :-
+    read_term(In, Term, []),
+    (   Term == end_of_file
+    ->  Counts = Loaded0-Skipped0
+    ;   tenant_fact_head(Term), ground(Term)
+    ->  assertz(Tenant:Term),
+        Loaded is Loaded0 + 1,
+        tenant_read(In, Tenant, Loaded-Skipped0, Counts)
+    ;   ( Term = (Head :- _) -> true ; Head = Term ),
+        tenant_fact_head(Head)
+    ->  Skipped is Skipped0 + 1,
+        tenant_read(In, Tenant, Loaded0-Skipped, Counts)
+    ;   tenant_read(In, Tenant, Loaded0-Skipped0, Counts)
+    ).
+
+tenant_fact_head(Head) :-
+    compound(Head),
+    compound_name_arity(Head, P, 2),
+    fact_table(P).
+
+tenant_unload(Tenant) :-
+    forall(fact_table(P), (functor(Head, P, 2), retractall(Tenant:Head))).
+
+tenant_size(Tenant, Bytes) :-
+    aggregate_all(sum(Size),
+                  ( fact_table(P), functor(Head, P, 2),
+                    predicate_property(Tenant:Head, size(Size)) ),
+                  Bytes).
+
+tenant_destination_info(Tenant, Dest, Budget, Interest, Visa, Docs, Season, MinBudget) :-
+    Tenant:destination_info(Dest, Budget, Interest, Visa, Docs, Season, MinBudget).
+
+tenant_visa_info(Tenant, Dest, Status, Difficulty, Docs) :-
+    Tenant:visa_info(Dest, Status, Difficulty, Docs).
+
+
+% ============================================================================
+% QUERY EXAMPLES (for testing in SWI-Prolog, with a KB loaded)
+% ============================================================================
+% ?- visa_info(turkey, Status, Difficulty, Docs).
+% ?- destination_info_batch([high, low], [beach, nature], Answers).
+% ?- tenant_destination_info(user, Dest, high, beach, Visa, Docs, Season, MinBudget).
+% ============================================================================
@@ -3,17 +3,1060 @@ Pakistani Travel & Visa Expert System - Enhanced Material Design UI
 Run this file after creating travel_kb.pl
 """
 
-from pyswip import Prolog
-import customtkinter as ctk
-from tkinter import messagebox
+import time
+
+_PROCESS_START = time.perf_counter()
+
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from collections.abc import Mapping
+from ctypes import byref, c_int
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from urllib.parse import parse_qsl, unquote, urlsplit
+import argparse
+import contextlib
+import csv
+import datetime
+import hashlib
+import json
+import math
+import shutil
 import sys
 import os
+import pickle
+import re
+import threading
+import zlib
+
+# Heavy imports are deferred to first use: importing pyswip boots the
+# SWI-Prolog runtime, customtkinter pulls in Tk, and asyncio and sqlite3
+# are only needed by the headless server and the result cache
+pyswip = None
+ctk = None
+messagebox = None
+np = None
+asyncio = None
+sqlite3 = None
+
+
+def _import_pyswip():
+    """Import pyswip (and start SWI-Prolog) if it is not loaded yet"""
+    global pyswip
+    if pyswip is None:
+        import pyswip.core
+        import pyswip.easy
+        import pyswip.prolog
+    return pyswip
+
+
+# Predicates the application queries besides the KB's own (visa_info/4, batch
+# queries, hot reload, tenants); consulted into every engine before the KB
+SUPPORT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kb_support.pl")
+
+
+def _prolog_path(path):
+    """Absolute path as a quoted-atom body for Prolog goal text"""
+    return os.path.abspath(path).replace(os.sep, '/').replace("'", "\\'")
+
+
+# Fact tables that hot reload patches in place; anything else changing in
+# the KB file means a full reconsult
+FACT_PREDICATES = (
+    'visa_status', 'budget_level', 'interest_match',
+    'min_budget', 'visa_documents', 'best_season',
+)
+_FACT_ARG = r"'(?:[^'\\]|\\.|'')*'|-?\d+|[a-z]\w*"
+_FACT_RE = re.compile(
+    rf"^[ \t]*({'|'.join(FACT_PREDICATES)})\([ \t]*({_FACT_ARG})[ \t]*,"
+    rf"[ \t]*({_FACT_ARG})[ \t]*\)[ \t]*\.[ \t]*(?:%[^\r\n]*)?\r?$",
+    re.MULTILINE,
+)
+
+
+def _fact_value(text):
+    """Python value of a fact argument: quoted or plain atom -> str, integer -> int
+    
+    Only the \\' and \\\\ escapes are decoded (see _split_facts).
+    """
+    if text.startswith("'"):
+        return re.sub(r"''|\\(.)", lambda m: m.group(1) or "'", text[1:-1])
+    if text[0] in '-0123456789':
+        return int(text)
+    return text
+
+
+def _split_facts(text):
+    """Split KB source into its hot-reloadable facts and everything else
+    
+    Facts come back as a Counter of (predicate, arg1, arg2) keys in file
+    order; the rest is the remaining code lines, for detecting rule changes.
+    Facts are None when the lines cannot be trusted to say what Prolog
+    loaded: a block comment may hide fact lines, other escapes than \\'
+    and \\\\ are not decoded, and retract/1 cannot tell duplicate clauses
+    apart. reload() then reconsults the whole file.
+    """
+    rest = [
+        line.rstrip() for line in _FACT_RE.sub('', text).splitlines()
+        if line.strip() and not line.lstrip().startswith('%')
+    ]
+    if '/*' in text:
+        return None, rest
+    facts = Counter()
+    for m in _FACT_RE.finditer(text):
+        args = m.group(2, 3)
+        if any(c not in "'\\" for arg in args for c in re.findall(r"\\(.)", arg, re.S)):
+            return None, rest
+        facts[(m.group(1),) + tuple(_fact_value(arg) for arg in args)] += 1
+    if any(count > 1 for count in facts.values()):
+        return None, rest
+    return facts, rest
+
+
+def _import_numpy():
+    """Import NumPy, used only by exact-amount ranking"""
+    global np
+    if np is None:
+        import numpy as np
+    return np
+
+
+def _import_asyncio():
+    """Import asyncio, used only by the headless server"""
+    global asyncio
+    if asyncio is None:
+        import asyncio
+    return asyncio
+
+
+def _import_sqlite3():
+    """Import sqlite3, used only by the persistent result cache"""
+    global sqlite3
+    if sqlite3 is None:
+        import sqlite3
+    return sqlite3
+
+
+def _import_gui():
+    """Import customtkinter and tkinter's messagebox if they are not loaded yet"""
+    global ctk, messagebox
+    if ctk is None:
+        import customtkinter as ctk
+        from tkinter import messagebox
+
+
+class Destination(Mapping):
+    """One recommended destination; read-only and shared between result lists
+    
+    TravelExpertSystem hands out a single instance per destination and KB
+    version, so repeated searches and cached results reference the same
+    record and its document and season text instead of copying them. Reads
+    like the result dicts it replaces: dest['visa_status'], dict(dest), ...
+    """
+    
+    FIELDS = ('destination', 'visa_status', 'documents', 'best_season', 'min_budget')
+    __slots__ = FIELDS
+    
+    def __init__(self, destination, visa_status, documents, best_season, min_budget):
+        for name, value in zip(self.FIELDS, (destination, visa_status, documents,
+                                             best_season, min_budget)):
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Destination records are shared and read-only")
+    
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self.FIELDS)
+    
+    def __len__(self):
+        return len(self.FIELDS)
+    
+    def __eq__(self, other):
+        if isinstance(other, Destination):
+            # Shared instances make the identity check the common case
+            return self is other or all(
+                getattr(self, name) == getattr(other, name) for name in self.FIELDS
+            )
+        return Mapping.__eq__(self, other)
+    
+    __hash__ = None
+    
+    def __reduce__(self):
+        return (Destination, tuple(getattr(self, name) for name in self.FIELDS))
+    
+    def __repr__(self):
+        return f"Destination({', '.join(f'{name}={getattr(self, name)!r}' for name in self.FIELDS)})"
+    
+    def to_dict(self):
+        """A plain dict of the fields, e.g. for json.dumps"""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+def json_default(obj):
+    """`default=` for json.dumps, so results containing Destination records serialize"""
+    if isinstance(obj, Destination):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class RecommendationTable:
+    """Immutable (budget, interest) -> results lookup built from one Prolog pass"""
+
+    def __init__(self, rows, version, build_seconds):
+        self._rows = MappingProxyType(rows)
+        self.version = version
+        self.build_seconds = build_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, budget, interest):
+        """Return the precomputed results, or None if the key was never enumerated"""
+        rows = self._rows.get((budget, interest))
+        if rows is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December')
+# Month name or abbreviation -> 0-based month
+_MONTH_NUMBERS = dict({m.lower(): i for i, m in enumerate(MONTHS)},
+                      **{m[:3].lower(): i for i, m in enumerate(MONTHS)}, sept=8)
+_MONTH_WORD = r"\b(%s)\b" % "|".join(sorted(_MONTH_NUMBERS, key=len, reverse=True))
+_RANGE_RE = re.compile(_MONTH_WORD + r"\s*(?:to|through|until|-|–)\s*" + _MONTH_WORD)
+# A month outside a range counts only as an item of its own ('March and Sept',
+# 'June, July'), so words like 'may' in 'may be hot' are not read as months
+_ITEM_SPLIT_RE = re.compile(r"[,;/&()]|\band\b|\bor\b")
+_MONTH_ITEM_RE = re.compile(r"\s*" + _MONTH_WORD + r"\s*")
+ALL_MONTHS = (1 << 12) - 1
+
+
+def _month_range(first, last):
+    """12-bit mask of 0-based months first..last, wrapping past December"""
+    bits = 0
+    for offset in range((last - first) % 12 + 1):
+        bits |= 1 << ((first + offset) % 12)
+    return bits
+
+
+@lru_cache(maxsize=None)
+def season_mask(text):
+    """12-bit mask (bit 0 = January) of the months a best_season/2 text covers
+    
+    'November to April (Dry season)' wraps into the new year; several ranges
+    or single months are ORed, and 'year-round' text covers every month.
+    Text naming no months ('Spring and autumn') gives 0.
+    """
+    text = text.lower()
+    bits = 0
+    for first, last in _RANGE_RE.findall(text):
+        bits |= _month_range(_MONTH_NUMBERS[first], _MONTH_NUMBERS[last])
+    for item in _ITEM_SPLIT_RE.split(text):
+        month = _MONTH_ITEM_RE.fullmatch(item)
+        if month:
+            bits |= 1 << _MONTH_NUMBERS[month.group(1)]
+    if not bits and re.search(r"year[- ]round|all year", text):
+        bits = ALL_MONTHS
+    return bits
+
+
+def _season_filter_mask(text):
+    """season_mask for month filters: a season that names no months is
+    unknown, so it matches every month rather than none"""
+    return season_mask(text) or ALL_MONTHS
+
+
+def month_bits(months):
+    """12-bit mask for a month filter
+    
+    Accepts a month number (1-12), a name or range text ('Dec', 'December to
+    February'), a date, a (start, end) pair of dates, or a list of these.
+    """
+    if isinstance(months, datetime.date):
+        return 1 << (months.month - 1)
+    if isinstance(months, int):
+        if not 1 <= months <= 12:
+            raise ValueError(f"Month must be 1-12, not {months}")
+        return 1 << (months - 1)
+    if isinstance(months, str):
+        bits = season_mask(months)
+        if not bits:
+            raise ValueError(f"Unknown month {months!r}")
+        return bits
+    months = list(months)
+    if len(months) == 2 and all(isinstance(m, datetime.date) for m in months):
+        start, end = months
+        if end < start:
+            raise ValueError("Date range ends before it starts")
+        if (end.year - start.year) * 12 + end.month - start.month >= 12:
+            return ALL_MONTHS
+        return _month_range(start.month - 1, end.month - 1)
+    bits = 0
+    for month in months:
+        bits |= month_bits(month)
+    return bits
+
+
+class DestinationColumns:
+    """Per-destination fact columns as NumPy arrays, for vectorized ranking
+    
+    Row i of every array describes names[i]; rows[i] is its Destination
+    record, as get_recommendations returns it.
+    """
+    
+    # visa_difficulty/2 level -> ease score
+    VISA_EASE = {'easy': 1.0, 'moderate': 0.5, 'difficult': 0.0}
+    # Relative weight of budget headroom, visa ease and interest match
+    WEIGHTS = {'headroom': 0.25, 'visa': 0.25, 'interest': 0.5}
+    
+    def __init__(self, rows, difficulties, interests, version, build_seconds):
+        np = _import_numpy()
+        self.rows = tuple(rows)
+        self.names = [row['destination'] for row in self.rows]
+        self.version = version
+        self.build_seconds = build_seconds
+        self.min_budget = np.array([row['min_budget'] for row in self.rows], dtype=np.float64)
+        self.visa_ease = np.array([self.VISA_EASE.get(d, 0.0) for d in difficulties], dtype=np.float64)
+        self.seasons = np.array([_season_filter_mask(row['best_season']) for row in self.rows],
+                                dtype=np.uint16)
+        # interest -> boolean mask over the rows
+        index = {name: i for i, name in enumerate(self.names)}
+        self.interests = {}
+        for dest, interest in interests:
+            if dest in index:
+                mask = self.interests.setdefault(interest, np.zeros(len(self.rows), dtype=bool))
+                mask[index[dest]] = True
+    
+    def scores(self, amount, interest=None, weights=None, months=None):
+        """Score every destination for a positive amount; unaffordable ones,
+        and with `months` (a month_bits mask) those out of season, get -inf"""
+        np = _import_numpy()
+        weights = dict(self.WEIGHTS, **(weights or {}))
+        amount = float(amount)
+        # Share of the budget left after the destination's minimum, 0..1
+        headroom = (amount - self.min_budget) / amount
+        scores = weights['headroom'] * headroom + weights['visa'] * self.visa_ease
+        if interest is not None:
+            # One interest or several; the match is the share of them offered
+            interests = [interest] if isinstance(interest, str) else list(interest)
+            masks = [self.interests[name] for name in interests if name in self.interests]
+            if masks:
+                scores = scores + weights['interest'] * (np.sum(masks, axis=0) / len(interests))
+        scores[headroom < 0] = -np.inf
+        if months is not None:
+            scores[(self.seasons & months) == 0] = -np.inf
+        return scores
+    
+    def top_k(self, amount, interest=None, k=10, weights=None, months=None):
+        """The k best affordable destinations, best first, each with its score"""
+        np = _import_numpy()
+        # NaN would score every row NaN and infinity would leave no headroom to rank
+        if not self.rows or k <= 0 or not (math.isfinite(amount) and amount > 0):
+            return []
+        scores = self.scores(amount, interest, weights, months)
+        k = min(k, len(scores))
+        # Partial sort: only the k best are ordered
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [
+            dict(self.rows[i], score=float(scores[i]))
+            for i in best.tolist() if scores[i] != -np.inf
+        ]
+    
+    def __len__(self):
+        return len(self.rows)
+
+
+def _bitmask(positions, size):
+    """Python int with the given bit positions set, built in O(size)"""
+    buffer = bytearray(size // 8 + 1)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class InterestIndex:
+    """Bitmasks over interest_match/2 and budget_level/2 for multi-interest queries
+    
+    Bit i of every mask stands for rows[i]. A (budget, interests) query is a
+    few integer ANDs/ORs followed by one pass over the set bits. month_masks[m]
+    holds the destinations whose best_season/2 covers 0-based month m, or
+    names no month at all (unknown_seasons).
+    """
+    
+    def __init__(self, rows, interests, levels, budget_matches, version, build_seconds):
+        self.rows = tuple(rows)
+        self.version = version
+        self.build_seconds = build_seconds
+        index = self.positions = {row['destination']: i for i, row in enumerate(self.rows)}
+        
+        def masks(pairs):
+            positions = {}
+            for dest, key in pairs:
+                if dest in index:
+                    positions.setdefault(key, []).append(index[dest])
+            return {key: _bitmask(bits, len(self.rows)) for key, bits in positions.items()}
+        
+        self.interest_masks = masks(interests)
+        level_masks = masks(levels)
+        # A traveller budget covers every destination level it budget_matches/2
+        self.budget_masks = {}
+        for budget, level in budget_matches:
+            self.budget_masks[budget] = self.budget_masks.get(budget, 0) | level_masks.get(level, 0)
+        # Destinations whose best_season/2 text names no months stay in every month
+        self.unknown_seasons = [row['destination'] for row in self.rows
+                                if not season_mask(row['best_season'])]
+        seasons = [_season_filter_mask(row['best_season']) for row in self.rows]
+        self.month_masks = [_bitmask([i for i, bits in enumerate(seasons) if bits >> month & 1],
+                                     len(self.rows))
+                            for month in range(12)]
+    
+    def months_mask(self, months):
+        """Bitmask of destinations in season during any month of a month_bits mask"""
+        combined = 0
+        for month in range(12):
+            if months >> month & 1:
+                combined |= self.month_masks[month]
+        return combined
+    
+    def in_season(self, results, months):
+        """The records of `results` in season during `months`, order kept"""
+        allowed = self.months_mask(months)
+        return [dest for dest in results
+                if allowed >> self.positions.get(dest['destination'], len(self.rows)) & 1]
+    
+    def interests_mask(self, interests, match='any'):
+        """Bitmask of destinations offering any/all of `interests`"""
+        selected = [self.interest_masks.get(name, 0) for name in interests]
+        if not selected:
+            return 0
+        combined = selected[0]
+        for other in selected[1:]:
+            combined = combined & other if match == 'all' else combined | other
+        return combined
+    
+    def mask(self, budget, interests, match='any'):
+        """Bitmask of destinations within `budget` offering any/all of `interests`"""
+        return self.interests_mask(interests, match) & self.budget_masks.get(budget, 0)
+    
+    def lookup(self, budget, interests, match='any'):
+        """Matching rows in knowledge-base order"""
+        return self.rows_for(self.mask(budget, interests, match))
+    
+    def rows_for(self, mask):
+        """Rows whose bits are set in `mask`, in knowledge-base order"""
+        bits = bin(mask)[:1:-1]   # Bit 0 first
+        rows = []
+        position = bits.find('1')
+        while position != -1:
+            rows.append(self.rows[position])
+            position = bits.find('1', position + 1)
+        return rows
+    
+    def __len__(self):
+        return len(self.rows)
+
+
+def _tokens(text):
+    """Search terms of a text: lowercase words, with a plural 's' dropped"""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return [w[:-1] if len(w) > 3 and w.endswith('s') and not w.endswith('ss') else w
+            for w in words]
+
+
+class TextIndex:
+    """Inverted index over the visa_documents/2 and best_season/2 text
+    
+    Each term maps to a bitmask over the same rows as InterestIndex, so a
+    text query combines with budget and interest filters by integer AND.
+    """
+    
+    FIELDS = {'documents': 'documents', 'season': 'best_season'}
+    
+    def __init__(self, rows, version, build_seconds=0.0):
+        self.rows = tuple(rows)
+        self.version = version
+        self.build_seconds = build_seconds
+        self.all = (1 << len(self.rows)) - 1
+        self.postings = {}                         # field -> term -> bitmask
+        for field, column in self.FIELDS.items():
+            positions = {}
+            for i, row in enumerate(self.rows):
+                for term in set(_tokens(row[column])):
+                    positions.setdefault(term, []).append(i)
+            self.postings[field] = {term: _bitmask(bits, len(self.rows))
+                                    for term, bits in positions.items()}
+    
+    @staticmethod
+    def parse(query):
+        """(required, excluded) terms of a query such as "bank statement -return" """
+        required, excluded = [], []
+        for word in query.split():
+            target = excluded if word.startswith('-') else required
+            target.extend(_tokens(word))
+        return required, excluded
+    
+    def term_mask(self, term, fields):
+        combined = 0
+        for field in fields:
+            combined |= self.postings[field].get(term, 0)
+        return combined
+    
+    def mask(self, query, fields=None):
+        """Bitmask of rows containing every required term and no excluded one"""
+        fields = tuple(fields or self.FIELDS)
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown search fields: {sorted(unknown)}")
+        required, excluded = self.parse(query)
+        combined = self.all
+        for term in required:
+            combined &= self.term_mask(term, fields)
+        for term in excluded:
+            combined &= ~self.term_mask(term, fields)
+        return combined
+    
+    def __len__(self):
+        return len(self.rows)
+
+
+class NativeRules:
+    """The fact tables Prolog consulted, hash-indexed in Python, with
+    can_visit/3, destination_info/7, visa_difficulty/2, in_budget_range/2
+    and visa_info/4 evaluated directly instead of through pyswip
+    
+    Only valid while the KB defines those rules exactly as RULES does (see
+    supports()); visa_info/4 comes from SUPPORT_FILE, so it never differs.
+    Solutions come in Prolog's order, duplicates included.
+    """
+    
+    RULES = (
+        "can_visit(Dest, Budget, Interest) :- interest_match(Dest, Interest), "
+        "budget_level(Dest, Level), budget_matches(Budget, Level).",
+        "destination_info(Dest, Budget, Interest, Visa, Docs, Season, MinBudget) :- "
+        "can_visit(Dest, Budget, Interest), visa_status(Dest, Visa), visa_documents(Dest, Docs), "
+        "best_season(Dest, Season), min_budget(Dest, MinBudget).",
+        "visa_difficulty(Dest, easy) :- visa_status(Dest, visa_free).",
+        "visa_difficulty(Dest, easy) :- visa_status(Dest, visa_on_arrival).",
+        "visa_difficulty(Dest, moderate) :- visa_status(Dest, e_visa).",
+        "visa_difficulty(Dest, difficult) :- visa_status(Dest, visa_required).",
+        "in_budget_range(Dest, UserBudgetAmount) :- min_budget(Dest, MinRequired), "
+        "UserBudgetAmount >= MinRequired.",
+    )
+    # The visa_difficulty/2 clauses, in order: visa status -> difficulty
+    DIFFICULTY = (('visa_free', 'easy'), ('visa_on_arrival', 'easy'),
+                  ('e_visa', 'moderate'), ('visa_required', 'difficult'))
+    # Fact tables read from Prolog, in clause order
+    FACTS = FACT_PREDICATES + ('budget_matches',)
+    
+    def __init__(self, facts, record, version, build_seconds=0.0):
+        self.record = record                       # TravelExpertSystem._record
+        self.version = version
+        self.build_seconds = build_seconds
+        self.fact_count = sum(len(pairs) for pairs in facts.values())
+        
+        def index(pairs, key=0):
+            table = {}
+            for pair in pairs:
+                table.setdefault(pair[key], []).append(pair[1 - key])
+            return table
+        
+        # interest_match/2 is looked up by interest, everything else by destination
+        self.interest_match = index(facts['interest_match'], key=1)
+        self.budget_level = index(facts['budget_level'])
+        self.visa_status = index(facts['visa_status'])
+        self.visa_documents = index(facts['visa_documents'])
+        self.best_season = index(facts['best_season'])
+        self.min_budget = index(facts['min_budget'])
+        self.budget_matches = {}                   # (budget, level) -> number of clauses
+        for pair in facts['budget_matches']:
+            self.budget_matches[pair] = self.budget_matches.get(pair, 0) + 1
+    
+    @staticmethod
+    def _clauses(code):
+        """Clauses of KB code with all layout removed, for comparing rule text"""
+        return re.split(r"\.(?=[a-z:]|$)", re.sub(r"\s+", "", code))
+    
+    @classmethod
+    def supports(cls, rest):
+        """True if the code lines of a KB (see _split_facts) define the native
+        rules exactly as RULES, so evaluating them in Python is equivalent"""
+        expected = cls._clauses(" ".join(cls.RULES))
+        heads = tuple({clause.split("(")[0] + "(" for clause in expected if clause})
+        actual = [clause for clause in cls._clauses(" ".join(rest)) if clause.startswith(heads)]
+        return actual == [clause for clause in expected if clause]
+    
+    def can_visit(self, budget, interest):
+        for dest in self.interest_match.get(interest, ()):
+            for level in self.budget_level.get(dest, ()):
+                for _ in range(self.budget_matches.get((budget, level), 0)):
+                    yield dest
+    
+    def destination_info(self, budget, interest):
+        """destination_info/7 solutions as Destination records"""
+        record = self.record
+        for dest in self.can_visit(budget, interest):
+            for visa in self.visa_status.get(dest, ()):
+                for docs in self.visa_documents.get(dest, ()):
+                    for season in self.best_season.get(dest, ()):
+                        for min_budget in self.min_budget.get(dest, ()):
+                            yield record(dest, visa, docs, season, min_budget)
+    
+    def visa_difficulty(self, dest):
+        statuses = self.visa_status.get(dest, ())
+        return [difficulty for status, difficulty in self.DIFFICULTY
+                for found in statuses if found == status]
+    
+    def in_budget_range(self, dest, amount):
+        return any(amount >= required for required in self.min_budget.get(dest, ()))
+    
+    def visa_info(self, dest):
+        """visa_info/4 solutions as (status, difficulty, documents)"""
+        for status in self.visa_status.get(dest, ()):
+            for difficulty in self.visa_difficulty(dest):
+                for docs in self.visa_documents.get(dest, ()):
+                    yield status, difficulty, docs
+
+
+class PreparedQuery:
+    """A Prolog predicate resolved once; each call only fills in the input arguments
+    
+    Inputs are written straight into argument terms, never parsed as query
+    text, so a value such as "beach), halt, (x" cannot change the goal.
+    """
+    
+    def __init__(self, name, arity, inputs):
+        _import_pyswip().Prolog._init_prolog_thread()
+        self.name = name
+        self.arity = arity
+        self.inputs = tuple(inputs)                # Argument positions bound per call
+        self.outputs = tuple(i for i in range(arity) if i not in self.inputs)
+        self._predicate = pyswip.core.PL_predicate(name, arity, None)
+        self._texts = {}                           # atom handle -> (Atom, str)
+    
+    def _put(self, term, value):
+        """Write a Python value into a term: str -> atom, int, list -> list"""
+        core = pyswip.core
+        if isinstance(value, str):
+            core.PL_put_atom_chars(term, value)
+        elif isinstance(value, int):
+            core.PL_put_integer(term, value)
+        elif isinstance(value, (list, tuple)):
+            core.PL_put_nil(term)
+            for item in reversed(value):
+                head = core.PL_new_term_ref()
+                self._put(head, item)
+                core.PL_cons_list(term, head, term)
+        else:
+            raise TypeError(f"Cannot pass {type(value).__name__} to {self.name}/{self.arity}")
+    
+    def _to_python(self, term):
+        """Read a bound term, decoding each distinct atom only once"""
+        core = pyswip.core
+        if core.PL_get_nil(term):
+            return []
+        
+        handle = core.atom_t()
+        if core.PL_get_atom(term, byref(handle)):
+            cached = self._texts.get(handle.value)
+            if cached is None:
+                # Holding the Atom keeps it registered, so the handle is never reused
+                atom = pyswip.Atom(handle.value)
+                cached = self._texts[handle.value] = (atom, atom.value)
+            return cached[1]
+        
+        if core.PL_is_list(term):
+            items = []
+            head, tail = core.PL_new_term_ref(), core.PL_copy_term_ref(term)
+            while core.PL_get_list(tail, head, tail):
+                items.append(self._to_python(head))
+            return items
+        
+        name, arity = core.atom_t(), c_int()
+        if core.PL_get_name_arity(term, byref(name), byref(arity)) and arity.value:
+            # Compound terms such as info(...) come back as a tuple of their arguments
+            arg = core.PL_new_term_ref()
+            values = []
+            for i in range(1, arity.value + 1):
+                core.PL_get_arg(i, term, arg)
+                values.append(self._to_python(arg))
+            return tuple(values)
+        
+        return pyswip.easy.getTerm(term)
+    
+    def solutions(self, *values):
+        """Yield a tuple of the output arguments for every solution"""
+        if len(values) != len(self.inputs):
+            raise ValueError(f"{self.name}/{self.arity} expects {len(self.inputs)} inputs")
+        
+        core = pyswip.core
+        pyswip.Prolog._init_prolog_thread()
+        frame = core.PL_open_foreign_frame()
+        try:
+            args = core.PL_new_term_refs(self.arity)
+            for position, value in zip(self.inputs, values):
+                self._put(args + position, value)
+            
+            flags = core.PL_Q_NODEBUG | core.PL_Q_CATCH_EXCEPTION
+            query = core.PL_open_query(None, flags, self._predicate, args)
+            try:
+                while core.PL_next_solution(query):
+                    yield tuple(self._to_python(args + i) for i in self.outputs)
+                exception = core.PL_exception(query)
+                if exception:
+                    raise pyswip.prolog.PrologError(
+                        f"{self.name}/{self.arity} raised {pyswip.easy.getTerm(exception)}"
+                    )
+            finally:
+                core.PL_close_query(query)
+        finally:
+            core.PL_discard_foreign_frame(frame)
+
+
+class Histogram:
+    """Bucketed counts of one measurement, plus percentiles of its recent values"""
+    
+    def __init__(self, buckets, window=1024):
+        self.buckets = tuple(buckets)              # Upper bounds; +Inf is implied
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)         # Rolling window for percentiles
+    
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+    
+    def percentile(self, fraction):
+        """Value below which `fraction` of the recent observations fall"""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    
+    def to_dict(self):
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': cumulative,
+            'recent': {
+                'window': len(self.recent),
+                'p50': self.percentile(0.50),
+                'p90': self.percentile(0.90),
+                'p99': self.percentile(0.99),
+                'max': max(self.recent, default=0.0),
+            },
+        }
+
+
+class Metrics:
+    """Opt-in histograms of query and render costs, exported as JSON or Prometheus text
+    
+    Components only record into a Metrics object when one was passed to
+    them; with metrics=None the hot paths skip instrumentation entirely.
+    """
+    
+    MS_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+    COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 10_000, 100_000, 1_000_000)
+    
+    # name -> (buckets, help text)
+    DEFINITIONS = {
+        'recommendation_wall_ms': (MS_BUCKETS, "get_recommendations wall time in milliseconds"),
+        'recommendation_inferences': (COUNT_BUCKETS, "Prolog inferences per get_recommendations call"),
+        'recommendation_solutions': (COUNT_BUCKETS, "Destinations returned per get_recommendations call"),
+        'search_wall_ms': (MS_BUCKETS, "GUI search time from click to rendered results in milliseconds"),
+        'first_result_ms': (MS_BUCKETS, "GUI search time from click to the first card in milliseconds"),
+        'render_ms': (MS_BUCKETS, "Result card reconciliation time in milliseconds"),
+        'http_request_ms': (MS_BUCKETS, "Server request handling time in milliseconds"),
+    }
+    
+    def __init__(self, window=1024, prefix="travel_"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms = {
+            name: Histogram(buckets, window) for name, (buckets, _) in self.DEFINITIONS.items()
+        }
+    
+    def observe(self, name, value):
+        with self._lock:
+            self._histograms[name].observe(value)
+    
+    def to_dict(self):
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in self._histograms.items()}
+    
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+    
+    def to_prometheus(self):
+        """Prometheus text exposition: one histogram per metric, plus recent percentiles"""
+        lines = []
+        for name, data in self.to_dict().items():
+            metric = self.prefix + name
+            lines.append(f"# HELP {metric} {self.DEFINITIONS[name][1]}")
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in data['buckets'].items():
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+            lines.append(f"{metric}_sum {data['sum']}")
+            lines.append(f"{metric}_count {data['count']}")
+            lines.append(f"# HELP {metric}_recent Percentiles of the last {data['recent']['window']} observations")
+            lines.append(f"# TYPE {metric}_recent gauge")
+            for quantile in ('p50', 'p90', 'p99'):
+                lines.append(f'{metric}_recent{{quantile="0.{quantile[1:]}"}} {data["recent"][quantile]}')
+        return "\n".join(lines) + "\n"
+    
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = metrics.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the console
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"✓ Metrics at http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+class ResultCache:
+    """Recommendation results persisted in SQLite, shared by every process
+    using the same knowledge base
+    
+    Entries are keyed by (KB content hash, query), so a changed travel_kb.pl
+    never reads stale results; invalidate() deletes other hashes' entries once
+    no process has used them for STALE_SECONDS.
+    A result list is stored as zlib-compressed JSON with each distinct string
+    once. The database runs in WAL mode, so readers in several processes do
+    not block each other or the writer. Past max_mb, the least recently used
+    entries are deleted. Hits are also kept in a small in-process LRU.
+    """
+    
+    MEMORY_ENTRIES = 4096            # Decoded results kept per process
+    CHECK_EVERY = 256                # Writes between exact size checks
+    STALE_SECONDS = 3600             # Idle time before another KB hash's entries are dropped
+    
+    def __init__(self, path, max_mb=64):
+        self.path = path
+        self.max_bytes = int(max_mb * 2**20)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()               # (kb_hash, query) -> results
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = _import_sqlite3().connect(path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " kb_hash TEXT NOT NULL, query TEXT NOT NULL, value BLOB NOT NULL,"
+            " used REAL NOT NULL, PRIMARY KEY (kb_hash, query)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        self._writes = 0
+        self._bytes = self._stored_bytes()
+    
+    def _stored_bytes(self):
+        return self._db.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM results").fetchone()[0]
+    
+    def _encode(self, results):
+        strings = {}
+        rows = [[strings.setdefault(dest[field], len(strings)) for field in Destination.FIELDS[:4]]
+                + [dest['min_budget']] for dest in results]
+        data = json.dumps([list(strings), rows], ensure_ascii=False, separators=(',', ':'))
+        return zlib.compress(data.encode('utf-8'))
+    
+    def _decode(self, value, record):
+        strings, rows = json.loads(zlib.decompress(value))
+        return [record(strings[a], strings[b], strings[c], strings[d], min_budget)
+                for a, b, c, d, min_budget in rows]
+    
+    def get(self, kb_hash, query, record):
+        """Cached results for `query` (a JSON-serializable key), or None
+        
+        Records are rebuilt through `record` so they are shared as usual.
+        """
+        key = (kb_hash, json.dumps(query))
+        with self._lock:
+            results = self._memory.get(key)
+            if results is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return list(results)
+            row = self._db.execute("SELECT value FROM results WHERE kb_hash = ? AND query = ?",
+                                   key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE results SET used = ? WHERE kb_hash = ? AND query = ?",
+                             (time.time(),) + key)
+            results = self._decode(row[0], record)
+            self._remember(key, results)
+            self.hits += 1
+            self.disk_hits += 1
+            return list(results)
+    
+    def put(self, kb_hash, query, results):
+        key = (kb_hash, json.dumps(query))
+        value = self._encode(results)
+        with self._lock:
+            self._remember(key, list(results))
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                             key + (value, time.time()))
+            self._bytes += len(value)
+            self._writes += 1
+            if self._writes % self.CHECK_EVERY == 0:
+                self._bytes = self._stored_bytes()   # Other processes write too
+            if self._bytes > self.max_bytes:
+                self._evict()
+    
+    def _remember(self, key, results):
+        self._memory[key] = results
+        if len(self._memory) > self.MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+    
+    def _evict(self):
+        """Delete least recently used entries until the cache is at 90% of its size"""
+        target = int(self.max_bytes * 0.9)
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            total = self._stored_bytes()
+            for kb_hash, query, size in self._db.execute(
+                    "SELECT kb_hash, query, LENGTH(value) FROM results ORDER BY used").fetchall():
+                if total <= target:
+                    break
+                self._db.execute("DELETE FROM results WHERE kb_hash = ? AND query = ?",
+                                 (kb_hash, query))
+                self._memory.pop((kb_hash, query), None)
+                total -= size
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._bytes = total
+    
+    def invalidate(self, kb_hash):
+        """Delete entries of other KB hashes that have not been used for STALE_SECONDS
+        
+        Processes still running another KB version, e.g. old workers during a
+        rolling restart, keep their entries in use, so they are not wiped;
+        the rest of the old entries go with LRU eviction.
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM results WHERE kb_hash != ? AND used < ?",
+                             (kb_hash, time.time() - self.STALE_SECONDS))
+            self._memory = OrderedDict((k, v) for k, v in self._memory.items() if k[0] == kb_hash)
+            self._bytes = self._stored_bytes()
+    
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                'path': self.path,
+                'entries': entries,
+                'bytes': self._stored_bytes(),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+            }
+    
+    def close(self):
+        with self._lock:
+            self._db.close()
+
 
 class TravelExpertSystem:
-    def __init__(self, kb_file="travel_kb.pl"):
-        self.prolog = Prolog()
+    BACKENDS = ('prolog', 'native')
+    # Age after which a snapshot lock file is assumed to be left over from a crash
+    SNAPSHOT_LOCK_SECONDS = 300
+    
+    def __init__(self, kb_file="travel_kb.pl", materialize=False, snapshot=True, watch=False,
+                 metrics=None, backend='prolog', result_cache=None, result_cache_mb=64):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, not {backend!r}")
+        # Seconds spent in each startup phase, for the startup breakdown
+        self.timings = {}
+        start = time.perf_counter()
+        _import_pyswip()
+        self.timings['import_pyswip'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.prolog = pyswip.Prolog()
+        pyswip.Prolog._init_prolog_thread()
+        self.prolog.consult(SUPPORT_FILE)
+        self.timings['engine_init'] = time.perf_counter() - start
+        
         self.kb_file = kb_file
+        self.materialize = materialize
+        # Compiled .qlf snapshots live beside the KB, keyed by its content hash
+        self.snapshot_dir = (
+            os.path.join(os.path.dirname(os.path.abspath(kb_file)), ".kb_cache")
+            if snapshot else None
+        )
+        self.kb_hash = None
+        self.loaded_from = None
+        self.metrics = metrics                     # Metrics instance, or None when off
+        self.backend = backend                     # 'native': NativeRules, Prolog as fallback
+        self._loaded_source = None                 # File Prolog recorded the clauses under
+        self._kb_text = None                       # Source as loaded, for reload diffs
+        self._kb_parts = None                      # _split_facts(_kb_text), built on first reload
+        self._watcher = None
+        # Bumped on every consult; derived tables compare against it
+        self.kb_version = 0
+        self._table = None
+        self._columns = None
+        self._records = {}                         # Destination atom -> shared Destination
+        self._interest_index = None
+        self._text_index = None
+        self._native = None                        # (kb_version, NativeRules or None)
+        # Persistent get_recommendations results: a path, or True for one beside the KB
+        if result_cache is True:
+            stem = os.path.splitext(os.path.basename(kb_file))[0]
+            result_cache = os.path.join(os.path.dirname(os.path.abspath(kb_file)), ".kb_cache",
+                                        f"{stem}-results.sqlite")
+        self.result_cache = ResultCache(result_cache, result_cache_mb) if result_cache else None
+        # pyswip allows a single open query; searches may come from worker threads
+        self._lock = threading.RLock()
         self._load_knowledge_base()
+        if watch:
+            self.watch()
     
     def _load_knowledge_base(self):
         """Load Prolog knowledge base from .pl file"""
@@ -23,30 +1066,1327 @@ class TravelExpertSystem:
                 f"Please create the travel_kb.pl file first."
             )
         
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                self._consult_kb()
+                source = " (compiled snapshot)" if self.loaded_from == "snapshot" else ""
+                print(f"✓ Loaded knowledge base: {self.kb_file}{source}")
+            except Exception as e:
+                raise Exception(f"Error loading Prolog file: {e}")
+            self.timings['consult'] = time.perf_counter() - start
+            
+            self.kb_version += 1
+            self._records = {}
+            if self.result_cache is not None:
+                self.result_cache.invalidate(self.kb_hash)
+            if self.materialize:
+                self._table = self._build_table()
+            
+            # destination_info(Dest, +Budget, +Interest, Visa, Docs, Season, MinBudget)
+            self._destination_query = PreparedQuery("destination_info", 7, inputs=(1, 2))
+            # destination_info_batch(+Budgets, +Interests, Answers)
+            self._batch_query = PreparedQuery("destination_info_batch", 3, inputs=(0, 1))
+            # kb_apply_changes(+Retract, +Assert)
+            self._apply_query = PreparedQuery("kb_apply_changes", 2, inputs=(0, 1))
+            # statistics(+Key, Value), for per-call inference counts
+            self._statistics_query = PreparedQuery("statistics", 2, inputs=(0,))
+            # visa_info(+Dest, Status, Difficulty, Docs)
+            self._visa_query = PreparedQuery("visa_info", 4, inputs=(0,))
+    
+    def _consult_kb(self):
+        """Consult the KB, through a compiled snapshot when one matches its contents"""
+        with open(self.kb_file, 'rb') as f:
+            data = f.read()
+        self.kb_hash = hashlib.sha256(data).hexdigest()[:16]
+        self._kb_text, self._kb_parts = data.decode('utf-8'), None
+        
+        if self._loaded_source is not None:
+            # Reconsulting: drop the previous clauses, including asserted facts
+            for name in FACT_PREDICATES:
+                list(self.prolog.query(f"retractall({name}(_, _))"))
+            list(self.prolog.query(f"unload_file('{_prolog_path(self._loaded_source)}')"))
+        
+        if self.snapshot_dir is None:
+            self.prolog.consult(self.kb_file)
+            self._loaded_source, self.loaded_from = self.kb_file, "source"
+            return
+        
+        stem = os.path.splitext(os.path.basename(self.kb_file))[0]
+        base = os.path.join(self.snapshot_dir, f"{stem}-{self.kb_hash}")
+        lock = base + ".lock"
+        # A .qlf is only complete once the engine compiling it released the lock
+        if os.path.exists(base + ".qlf") and not os.path.exists(lock):
+            if self._consult_snapshot(base):
+                return
+        
+        self.loaded_from = "source"
         try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            self._lock_snapshot(lock)
+        except OSError as e:
+            print(f"Could not write KB snapshot: {e}")
             self.prolog.consult(self.kb_file)
-            print(f"✓ Loaded knowledge base: {self.kb_file}")
+            self._loaded_source = self.kb_file
+            return
+        
+        try:
+            # Another engine may have compiled it while this one waited
+            if os.path.exists(base + ".qlf") and self._consult_snapshot(base):
+                return
+            # qcompile/1 loads the file and writes <file>.qlf next to it, so
+            # compile a copy named after the hash instead of travel_kb.pl itself
+            shutil.copyfile(self.kb_file, base + ".pl")
+            list(self.prolog.query(f"qcompile('{_prolog_path(base + '.pl')}')"))
+            self._loaded_source = base + ".pl"
         except Exception as e:
-            raise Exception(f"Error loading Prolog file: {e}")
+            print(f"Could not write KB snapshot: {e}")
+            self.prolog.consult(self.kb_file)
+            self._loaded_source = self.kb_file
+            return
+        finally:
+            # Gone already if another engine took it over as stale
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(lock)
+        
+        # Snapshots of earlier versions of this KB can never match again. The
+        # directory also holds the result cache, so match snapshot names exactly
+        snapshot = re.compile(re.escape(stem) + r"-[0-9a-f]{16}\.(pl|qlf)")
+        for name in os.listdir(self.snapshot_dir):
+            if snapshot.fullmatch(name) and not name.startswith(os.path.basename(base)):
+                os.remove(os.path.join(self.snapshot_dir, name))
     
-    def get_recommendations(self, budget, interest):
-        """Query Prolog for travel recommendations"""
-        query = f"destination_info(Dest, {budget}, {interest}, Visa, Docs, Season, MinBudget)"
-        results = []
-        
+    def _consult_snapshot(self, base):
+        """Consult a compiled snapshot, removing it if it cannot be loaded"""
         try:
+            self.prolog.consult(base + ".qlf")
+            self._loaded_source, self.loaded_from = base + ".pl", "snapshot"
+            return True
+        except Exception as e:
+            # Written by another SWI-Prolog version, or truncated
+            print(f"Ignoring KB snapshot {base}.qlf: {e}")
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(base + ".qlf")
+            return False
+    
+    def _lock_snapshot(self, lock):
+        """Create the lock file that lets one engine at a time write a snapshot
+        
+        Engines started together would otherwise copy and qcompile the same
+        files at once. Waits while another engine holds the lock; a lock older
+        than SNAPSHOT_LOCK_SECONDS was left behind by a crash and is taken over.
+        """
+        while True:
+            try:
+                os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return
+            except FileExistsError:
+                pass
+            try:
+                if time.time() - os.path.getmtime(lock) > self.SNAPSHOT_LOCK_SECONDS:
+                    os.remove(lock)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(0.05)
+    
+    def reload(self):
+        """Bring Prolog up to date with the KB file, touching only changed facts
+        
+        Facts of FACT_PREDICATES that were removed or added are retracted and
+        asserted in one call; any other edit falls back to a full reconsult.
+        Queries hold the same lock, so each one sees either the old or the
+        new knowledge base, never a mix. Returns a summary of what changed.
+        """
+        start = time.perf_counter()
+        with open(self.kb_file, 'rb') as f:
+            data = f.read()
+        kb_hash = hashlib.sha256(data).hexdigest()[:16]
+        
+        with self._lock:
+            summary = {'mode': 'unchanged', 'added': 0, 'removed': 0}
+            if kb_hash == self.kb_hash:
+                summary['ms'] = (time.perf_counter() - start) * 1000
+                return summary
+            
+            if self._kb_parts is None:
+                self._kb_parts = _split_facts(self._kb_text)
+            old_facts, old_rest = self._kb_parts
+            text = data.decode('utf-8')
+            new_facts, new_rest = _split_facts(text)
+            
+            if old_facts is None or new_facts is None or new_rest != old_rest:
+                self._load_knowledge_base()
+                summary['mode'] = 'reconsult'
+            else:
+                removed = [list(fact) for fact in (old_facts - new_facts).elements()]
+                added = [list(fact) for fact in (new_facts - old_facts).elements()]
+                list(self._apply_query.solutions(removed, added))
+                self.kb_hash, self._kb_text = kb_hash, text
+                self._kb_parts = (new_facts, new_rest)
+                self.kb_version += 1
+                self._records = {}
+                if self.result_cache is not None:
+                    self.result_cache.invalidate(self.kb_hash)
+                summary.update(mode='incremental', added=len(added), removed=len(removed))
+        
+        summary['ms'] = (time.perf_counter() - start) * 1000
+        if summary['mode'] == 'incremental':
+            print(f"✓ Reloaded knowledge base: +{summary['added']} -{summary['removed']} facts "
+                  f"in {summary['ms']:.1f} ms")
+        else:
+            print(f"✓ Reloaded knowledge base: full reconsult in {summary['ms']:.1f} ms")
+        return summary
+    
+    def watch(self, interval=1.0):
+        """Reload whenever the KB file changes, polling every `interval` seconds"""
+        if self._watcher is not None:
+            return
+        self._watch_stop = threading.Event()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(interval,), name="kb-watcher", daemon=True
+        )
+        self._watcher.start()
+    
+    def stop_watching(self):
+        """Stop the watcher started by watch()"""
+        if self._watcher is not None:
+            self._watch_stop.set()
+            self._watcher.join()
+            self._watcher = None
+    
+    def _kb_stat(self):
+        """(mtime, size) of the KB file, or None while an editor is replacing it"""
+        try:
+            st = os.stat(self.kb_file)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _watch_loop(self, interval):
+        loaded = seen = self._kb_stat()
+        while not self._watch_stop.wait(interval):
+            current = self._kb_stat()
+            if current != seen:
+                # Still being written; reload once it has been stable for a poll
+                seen = current
+                continue
+            if current is None or current == loaded:
+                continue
+            loaded = current
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Knowledge base reload failed: {e}")
+    
+    def _record(self, dest, visa, docs, season, min_budget):
+        """The shared Destination for these facts, created on first sight"""
+        record = self._records.get(dest)
+        if record is None or not (record.visa_status == visa and record.documents == docs
+                                  and record.best_season == season
+                                  and record.min_budget == min_budget):
+            record = self._records[dest] = Destination(dest, visa, docs, season, min_budget)
+        return record
+    
+    def _build_native(self):
+        """NativeRules over the facts Prolog holds, or None if the KB's rules
+        differ from the ones NativeRules implements"""
+        if self._kb_parts is None:
+            self._kb_parts = _split_facts(self._kb_text)
+        if not NativeRules.supports(self._kb_parts[1]):
+            print("⚠ Native backend: the knowledge base rules differ from the native ones; "
+                  "using Prolog")
+            return None
+        
+        start = time.perf_counter()
+        with self._lock:
+            facts = {name: [(s['A'], s['B']) for s in self.prolog.query(f"{name}(A, B)")]
+                     for name in NativeRules.FACTS}
+        rules = NativeRules(facts, self._record, self.kb_version, time.perf_counter() - start)
+        print(f"✓ Native backend: indexed {rules.fact_count} facts in "
+              f"{rules.build_seconds * 1000:.1f} ms")
+        return rules
+    
+    def _current_native(self):
+        """The native rules for this KB version, or None to use Prolog"""
+        if self.backend != 'native':
+            return None
+        native = self._native
+        if native is None or native[0] != self.kb_version:
+            with self._lock:
+                native = self._native = (self.kb_version, self._build_native())
+        return native[1]
+    
+    def _build_table(self):
+        """Enumerate every budget/interest combination in a single Prolog query"""
+        start = time.perf_counter()
+        with self._lock:
+            budgets = {s['B'] for s in self.prolog.query("budget_matches(B, _)")}
+            interests = {s['I'] for s in self.prolog.query("interest_match(_, I)")}
+            grouped = {(b, i): [] for b in budgets for i in interests}
+            
+            query = "destination_info(Dest, Budget, Interest, Visa, Docs, Season, MinBudget)"
             for solution in self.prolog.query(query):
-                results.append({
-                    'destination': solution['Dest'],
-                    'visa_status': solution['Visa'],
-                    'documents': solution['Docs'],
-                    'best_season': solution['Season'],
-                    'min_budget': solution['MinBudget']
-                })
+                key = (solution['Budget'], solution['Interest'])
+                grouped.setdefault(key, []).append(self._record(
+                    solution['Dest'], solution['Visa'], solution['Docs'],
+                    solution['Season'], solution['MinBudget']
+                ))
+        
+        rows = {key: tuple(results) for key, results in grouped.items()}
+        table = RecommendationTable(rows, self.kb_version, time.perf_counter() - start)
+        print(f"✓ Materialized {len(table)} recommendation sets "
+              f"in {table.build_seconds * 1000:.1f} ms")
+        return table
+    
+    def _current_table(self):
+        """The materialized table, rebuilt first if the KB changed since"""
+        table = self._table
+        if table is None or table.version != self.kb_version:
+            with self._lock:
+                table = self._table = self._build_table()
+        return table
+    
+    def _destination_rows(self):
+        """One result row per destination that has every fact, with its visa difficulty"""
+        query = ("visa_status(Dest, Visa), visa_difficulty(Dest, Difficulty), "
+                 "visa_documents(Dest, Docs), best_season(Dest, Season), min_budget(Dest, MinBudget)")
+        rows, difficulties, seen = [], [], set()
+        with self._lock:
+            for solution in self.prolog.query(query):
+                if solution['Dest'] in seen:
+                    continue  # One row per destination even if a fact is duplicated
+                seen.add(solution['Dest'])
+                rows.append(self._record(
+                    solution['Dest'], solution['Visa'], solution['Docs'],
+                    solution['Season'], solution['MinBudget']
+                ))
+                difficulties.append(solution['Difficulty'])
+        return rows, difficulties
+    
+    def _build_columns(self):
+        """Extract the fact columns used by rank_by_amount in two Prolog queries"""
+        start = time.perf_counter()
+        with self._lock:
+            rows, difficulties = self._destination_rows()
+            interests = [(s['Dest'], s['I']) for s in self.prolog.query("interest_match(Dest, I)")]
+        
+        columns = DestinationColumns(rows, difficulties, interests, self.kb_version,
+                                     time.perf_counter() - start)
+        print(f"✓ Extracted ranking columns for {len(columns)} destinations "
+              f"in {columns.build_seconds * 1000:.1f} ms")
+        return columns
+    
+    def _current_columns(self):
+        """The ranking columns, rebuilt first if the KB changed since"""
+        columns = self._columns
+        if columns is None or columns.version != self.kb_version:
+            with self._lock:
+                columns = self._columns = self._build_columns()
+        return columns
+    
+    def rank_by_amount(self, amount, interest=None, k=10, weights=None, months=None):
+        """Top-k destinations affordable with an exact budget in USD, best first
+        
+        Each destination is scored on budget headroom, visa_difficulty/2 and
+        how many of `interest` (one name or a list) it matches, over columns
+        extracted once per KB version. With `months` (see month_bits), only
+        destinations in season are ranked. Results are dicts of the Destination
+        fields plus a 'score'. A NaN or infinite amount raises ValueError.
+        """
+        if not math.isfinite(amount):
+            raise ValueError(f"amount must be a finite number, not {amount!r}")
+        months = None if months is None else month_bits(months)
+        return self._current_columns().top_k(amount, interest, k, weights, months)
+    
+    def _build_interest_index(self):
+        """Read the facts behind InterestIndex in four Prolog queries"""
+        start = time.perf_counter()
+        with self._lock:
+            rows, _ = self._destination_rows()
+            interests = [(s['D'], s['I']) for s in self.prolog.query("interest_match(D, I)")]
+            levels = [(s['D'], s['L']) for s in self.prolog.query("budget_level(D, L)")]
+            matches = [(s['B'], s['L']) for s in self.prolog.query("budget_matches(B, L)")]
+        
+        index = InterestIndex(rows, interests, levels, matches, self.kb_version,
+                              time.perf_counter() - start)
+        print(f"✓ Indexed {len(index.interest_masks)} interests over {len(index)} destinations "
+              f"in {index.build_seconds * 1000:.1f} ms")
+        if index.unknown_seasons:
+            print(f"Warning: {len(index.unknown_seasons)} best_season texts name no months and "
+                  f"match every month filter: {', '.join(index.unknown_seasons[:5])}"
+                  f"{', ...' if len(index.unknown_seasons) > 5 else ''}")
+        return index
+    
+    def _current_interest_index(self):
+        """The interest index, rebuilt first if the KB changed since"""
+        index = self._interest_index
+        if index is None or index.version != self.kb_version:
+            with self._lock:
+                index = self._interest_index = self._build_interest_index()
+        return index
+    
+    def _current_text_index(self):
+        """The document/season text index, rebuilt first if the KB changed since"""
+        index = self._text_index
+        if index is None or index.version != self.kb_version:
+            with self._lock:
+                rows = self._current_interest_index()
+                start = time.perf_counter()
+                # Same rows as the interest index, so their bitmasks line up
+                index = TextIndex(rows.rows, rows.version)
+                index.build_seconds = time.perf_counter() - start
+                self._text_index = index
+            print(f"✓ Indexed {sum(map(len, index.postings.values()))} terms over "
+                  f"{len(index)} destinations in {index.build_seconds * 1000:.1f} ms")
+        return index
+    
+    def search_text(self, query, budget=None, interests=None, match='any', fields=None,
+                    months=None):
+        """Destinations whose visa documents or best season match `query`
+        
+        Every term must appear, and none prefixed with '-' may, e.g.
+        "bank statement -return". `fields` narrows the search to 'documents'
+        or 'season'. Optional budget and interest filters work as in
+        get_recommendations_multi, and `months` as in get_recommendations.
+        Results are in knowledge-base order.
+        """
+        if match not in ('any', 'all'):
+            raise ValueError(f"match must be 'any' or 'all', not {match!r}")
+        index = self._current_text_index()
+        filters = self._current_interest_index()
+        bits = index.mask(query, fields)
+        if budget is not None:
+            bits &= filters.budget_masks.get(budget, 0)
+        if interests:
+            bits &= filters.interests_mask(interests, match)
+        if months is not None:
+            bits &= filters.months_mask(month_bits(months))
+        return filters.rows_for(bits)
+    
+    def visa_info(self, destination):
+        """Visa status, visa_difficulty/2 level and documents of one destination,
+        or None if the destination is unknown"""
+        native = self._current_native()
+        if native is not None:
+            for status, difficulty, docs in native.visa_info(destination):
+                return {
+                    'destination': destination,
+                    'visa_status': status,
+                    'visa_difficulty': difficulty,
+                    'documents': docs
+                }
+            return None
+        with self._lock:
+            solutions = self._visa_query.solutions(destination)
+            try:
+                for status, difficulty, docs in solutions:
+                    return {
+                        'destination': destination,
+                        'visa_status': status,
+                        'visa_difficulty': difficulty,
+                        'documents': docs
+                    }
+            finally:
+                solutions.close()
+        return None
+    
+    def get_recommendations_multi(self, budget, interests, match='any', months=None):
+        """Destinations within `budget` offering any (match='any') or all
+        (match='all') of `interests`, in knowledge-base order
+        
+        Answered from a bitmask index, so the cost does not grow with the
+        number of interests selected. `months` works as in get_recommendations.
+        """
+        if match not in ('any', 'all'):
+            raise ValueError(f"match must be 'any' or 'all', not {match!r}")
+        index = self._current_interest_index()
+        bits = index.mask(budget, interests, match)
+        if months is not None:
+            bits &= index.months_mask(month_bits(months))
+        return index.rows_for(bits)
+    
+    def table_stats(self):
+        """Hit/miss counters and build time of the materialized table"""
+        table = self._table
+        if table is None:
+            return None
+        return {
+            'version': table.version,
+            'stale': table.version != self.kb_version,
+            'entries': len(table),
+            'hits': table.hits,
+            'misses': table.misses,
+            'build_ms': table.build_seconds * 1000,
+        }
+    
+    def get_recommendations(self, budget, interest, months=None):
+        """Query Prolog for travel recommendations
+        
+        With `months` (a month, range or dates; see month_bits), only the
+        destinations whose best season overlaps them are kept, using the
+        month masks of the interest index. With a result cache, answers are
+        read from and stored in it.
+        """
+        months = None if months is None else month_bits(months)
+        cache, kb_hash, version = self.result_cache, self.kb_hash, self.kb_version
+        if cache is not None:
+            results = cache.get(kb_hash, [budget, interest, months], self._record)
+            if results is not None:
+                return results
+        
+        failures = []
+        if self.metrics is not None:
+            results = self._measured_recommendations(budget, interest, failures)
+        else:
+            results = self._recommendations(budget, interest, failures)
+        if months is not None:
+            results = self._current_interest_index().in_season(results, months)
+        # A reload while this ran would make the results newer than kb_hash, and
+        # a query error leaves them incomplete; neither is stored
+        if cache is not None and version == self.kb_version and not failures:
+            cache.put(kb_hash, [budget, interest, months], results)
+        return results
+    
+    def _measured_recommendations(self, budget, interest, failures=None):
+        """get_recommendations, recording wall time, inferences and solution count"""
+        start = time.perf_counter()
+        with self._lock:
+            inferences = self._inferences()
+            results = self._recommendations(budget, interest, failures)
+            inferences = self._inferences() - inferences
+        self.metrics.observe('recommendation_wall_ms', (time.perf_counter() - start) * 1000)
+        self.metrics.observe('recommendation_inferences', inferences)
+        self.metrics.observe('recommendation_solutions', len(results))
+        return results
+    
+    def _inferences(self):
+        """Inferences this thread has run so far, from statistics/2"""
+        for (count,) in self._statistics_query.solutions("inferences"):
+            return count
+        return 0
+    
+    def _recommendations(self, budget, interest, failures=None):
+        if self.materialize:
+            results = self._current_table().lookup(budget, interest)
+            if results is not None:
+                return results
+        native = self._current_native()
+        if native is not None:
+            return list(native.destination_info(budget, interest))
+        return list(self._solutions(budget, interest, failures))
+    
+    def iter_recommendations(self, budget, interest):
+        """Yield recommendations one by one as Prolog finds them
+        
+        Same results and order as get_recommendations. The engine lock is
+        held until the generator is exhausted or closed; stopping early
+        (break, close()) closes the Prolog query.
+        """
+        if self.materialize:
+            results = self._current_table().lookup(budget, interest)
+            if results is not None:
+                yield from results
+                return
+        native = self._current_native()
+        if native is not None:
+            yield from native.destination_info(budget, interest)
+            return
+        yield from self._solutions(budget, interest)
+    
+    def _solutions(self, budget, interest, failures=None):
+        """destination_info/7 solutions as Destination records, under the engine lock
+        
+        A Prolog error ends the solutions early; it is printed and, when a
+        `failures` list is given, appended to it.
+        """
+        with self._lock:
+            solutions = self._destination_query.solutions(budget, interest)
+            try:
+                for dest, visa, docs, season, min_budget in solutions:
+                    yield self._record(dest, visa, docs, season, min_budget)
+            except Exception as e:
+                print(f"Prolog query error: {e}")
+                if failures is not None:
+                    failures.append(e)
+            finally:
+                solutions.close()
+    
+    def get_recommendations_many(self, profiles):
+        """Answer a batch of (budget, interest) profiles with one Prolog query
+        
+        Returns one result list per profile, in order, each equal to what
+        get_recommendations would return. Identical profiles are answered
+        once and share their result lists' records. A Prolog error is raised.
+        """
+        profiles = [tuple(profile) for profile in profiles]
+        answers = {}
+        pending = []
+        for key in dict.fromkeys(profiles):
+            if self.materialize:
+                results = self._current_table().lookup(*key)
+                if results is not None:
+                    answers[key] = results
+                    continue
+            pending.append(key)
+        
+        native = self._current_native()
+        if pending and native is not None:
+            for key in pending:
+                answers[key] = list(native.destination_info(*key))
+        elif pending:
+            # A Prolog error propagates: empty lists would pass for "no matches"
+            with self._lock:
+                for (batch,) in self._batch_query.solutions(
+                        [budget for budget, _ in pending],
+                        [interest for _, interest in pending]):
+                    for key, rows in zip(pending, batch):
+                        answers[key] = [self._record(*row) for row in rows]
+        
+        return [list(answers.get(key, ())) for key in profiles]
+
+
+class MultiOriginSystem:
+    """Knowledge bases for several passport countries served by one Prolog engine
+    
+    kb_file is consulted once, by a TravelExpertSystem, for the rules and
+    budget_matches/2 every origin shares; its own facts answer for
+    default_origin. Any other origin's KB contributes only its fact tables,
+    which are loaded into a Prolog module of their own on first use. While
+    the loaded origins' facts take more than memory_cap_mb, the least
+    recently used ones are unloaded again.
+    """
+    
+    def __init__(self, origins, kb_file="travel_kb.pl", default_origin=None, memory_cap_mb=256,
+                 **engine_options):
+        self.system = TravelExpertSystem(kb_file, **engine_options)
+        self.origins = dict(origins)               # Origin name -> KB file
+        self.default_origin = default_origin
+        self.memory_cap = int(memory_cap_mb * 2**20)
+        self.loads = 0
+        self.evictions = 0
+        self._loaded = OrderedDict()               # Origin -> bytes of facts, least recent first
+        self._records = {}                         # Origin -> {destination atom: Destination}
+        self._lock = self.system._lock             # The engine is shared with self.system
+        with self._lock:
+            # tenant_load(+Tenant, +File, Loaded, Skipped)
+            self._load_query = PreparedQuery("tenant_load", 4, inputs=(0, 1))
+            self._unload_query = PreparedQuery("tenant_unload", 1, inputs=(0,))
+            self._size_query = PreparedQuery("tenant_size", 2, inputs=(0,))
+            # tenant_destination_info(+Tenant, Dest, +Budget, +Interest, Visa, Docs, Season, MinBudget)
+            self._destination_query = PreparedQuery("tenant_destination_info", 8, inputs=(0, 2, 3))
+            self._visa_query = PreparedQuery("tenant_visa_info", 5, inputs=(0, 1))
+    
+    @staticmethod
+    def _module(origin):
+        return "kb_" + re.sub(r"\W", "_", origin.lower())
+    
+    def _tenant(self, origin):
+        """Prolog module holding the facts of `origin`, loading them if needed"""
+        if origin not in self.origins and origin != self.default_origin:
+            raise KeyError(f"Unknown origin {origin!r}")
+        if origin == self.default_origin:
+            return 'user'
+        
+        module = self._module(origin)
+        with self._lock:
+            if origin in self._loaded:
+                self._loaded.move_to_end(origin)
+                return module
+            
+            start = time.perf_counter()
+            path = os.path.abspath(self.origins[origin]).replace(os.sep, '/')
+            loaded = skipped = 0
+            for loaded, skipped in self._load_query.solutions(module, path):
+                pass
+            if skipped:
+                print(f"Warning: origin {origin} has {skipped} fact-table clauses that are "
+                      f"not plain facts (rules or variables); they were not loaded")
+            size = 0
+            for (size,) in self._size_query.solutions(module):
+                pass
+            self._loaded[origin] = size
+            self.loads += 1
+            print(f"✓ Loaded origin {origin}: {loaded} facts, {size / 1024:.0f} KiB "
+                  f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+            
+            # Never evict the origin just loaded, even if it alone is over the cap
+            while sum(self._loaded.values()) > self.memory_cap and len(self._loaded) > 1:
+                self.evict(next(iter(self._loaded)))
+        return module
+    
+    def evict(self, origin):
+        """Unload the facts of `origin`; its next query loads them again"""
+        with self._lock:
+            if self._loaded.pop(origin, None) is None:
+                return
+            list(self._unload_query.solutions(self._module(origin)))
+            self._records.pop(origin, None)
+            self.evictions += 1
+        print(f"✓ Evicted origin {origin}")
+    
+    def _record(self, origin, dest, visa, docs, season, min_budget):
+        """The shared Destination of `origin` for these facts"""
+        records = self._records.setdefault(origin, {})
+        record = records.get(dest)
+        if record is None or not (record.visa_status == visa and record.documents == docs
+                                  and record.best_season == season
+                                  and record.min_budget == min_budget):
+            record = records[dest] = Destination(dest, visa, docs, season, min_budget)
+        return record
+    
+    def get_recommendations(self, origin, budget, interest):
+        """get_recommendations for a traveller holding an `origin` passport"""
+        if origin == self.default_origin:
+            return self.system.get_recommendations(budget, interest)
+        with self._lock:
+            solutions = self._destination_query.solutions(self._tenant(origin), budget, interest)
+            try:
+                return [self._record(origin, *row) for row in solutions]
+            except Exception as e:
+                print(f"Prolog query error: {e}")
+                return []
+            finally:
+                solutions.close()
+    
+    def visa_info(self, origin, destination):
+        """visa_info for a traveller holding an `origin` passport"""
+        if origin == self.default_origin:
+            return self.system.visa_info(destination)
+        with self._lock:
+            solutions = self._visa_query.solutions(self._tenant(origin), destination)
+            try:
+                for status, difficulty, docs in solutions:
+                    return {
+                        'destination': destination,
+                        'visa_status': status,
+                        'visa_difficulty': difficulty,
+                        'documents': docs
+                    }
+            finally:
+                solutions.close()
+        return None
+    
+    def stats(self):
+        """Loaded origins with their fact sizes, and load/eviction counters"""
+        with self._lock:
+            return {
+                'loaded': dict(self._loaded),
+                'bytes': sum(self._loaded.values()),
+                'memory_cap': self.memory_cap,
+                'loads': self.loads,
+                'evictions': self.evictions,
+            }
+
+
+def _portable_exception(e):
+    """`e` if it survives pickling, so the pool can re-raise the same class,
+    otherwise a RuntimeError with its type and message"""
+    try:
+        pickle.loads(pickle.dumps(e))
+        return e
+    except Exception:
+        return RuntimeError(f"{type(e).__name__}: {e}")
+
+
+def _engine_worker(kb_file, engine_options, conn):
+    """Body of an EnginePool process: one engine, answering requests from `conn`"""
+    # Status lines go to stderr, since the parent's stdout may be carrying
+    # --batch results; spawned processes do not inherit its sys.stdout swap
+    with contextlib.suppress(OSError):
+        os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    try:
+        system = TravelExpertSystem(kb_file, **engine_options)
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+        return
+    conn.send(('ready', system.kb_hash))
+    
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return  # Pool went away
+        if request is None:
+            return
+        method, args = request
+        try:
+            if method == 'ping':
+                reply = ('ok', system.kb_version)
+            elif method in EnginePool.METHODS:
+                reply = ('ok', getattr(system, method)(*args))
+            else:
+                reply = ('error', AttributeError(f"EnginePool does not forward {method!r}"))
         except Exception as e:
-            print(f"Prolog query error: {e}")
+            reply = ('error', _portable_exception(e))
+        # The KB hash rides along so the pool sees a --watch reload on the next reply
+        conn.send(reply + (system.kb_hash,))
+
+
+class _PoolWorker:
+    """Parent-side handle of one engine process"""
+    
+    def __init__(self, index, context, kb_file, engine_options):
+        self.index = index
+        self.calls = 0
+        self.kb_hash = None                        # As of the engine's latest reply
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_engine_worker, args=(kb_file, engine_options, child),
+            name=f"prolog-engine-{index}", daemon=True
+        )
+        self.process.start()
+        child.close()
+    
+    def wait_ready(self, timeout):
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"Engine {self.index} did not start within {timeout} s")
+        status, value = self.conn.recv()
+        if status != 'ready':
+            raise RuntimeError(f"Engine {self.index} failed to start: {value}")
+        self.kb_hash = value
+    
+    def request(self, method, args, timeout):
+        """Send one call and wait for its (status, value) reply
+        
+        An exception the method raised comes back as ('error', exception)
+        rather than being raised here, so that EOFError/OSError always mean
+        the process died.
+        """
+        self.conn.send((method, args))
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"Engine {self.index} did not answer {method} within {timeout} s")
+        status, value, self.kb_hash = self.conn.recv()
+        self.calls += status == 'ok'
+        return status, value
+    
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class EnginePool:
+    """TravelExpertSystem API spread over N processes, each with its own engine
+    
+    pyswip serializes everything through one SWI-Prolog instance per
+    process, so a pool is the way to use several cores. Calls block while
+    every engine is busy (back-pressure); an engine that crashes is
+    restarted and the call retried once, one that hangs past call_timeout
+    is restarted and the call fails. A health thread pings idle engines.
+    """
+    
+    # Read-only TravelExpertSystem methods a worker will run
+    METHODS = ('get_recommendations', 'get_recommendations_many',
+               'get_recommendations_multi', 'rank_by_amount', 'visa_info', 'search_text')
+    
+    def __init__(self, kb_file="travel_kb.pl", workers=None, call_timeout=30.0,
+                 queue_timeout=None, health_interval=5.0, startup_timeout=60.0,
+                 metrics=None, **engine_options):
+        import multiprocessing
+        import queue
         
+        self.kb_file = kb_file
+        self.call_timeout = call_timeout
+        self.queue_timeout = queue_timeout         # None: wait for a free engine indefinitely
+        self.startup_timeout = startup_timeout
+        self.metrics = metrics                     # Recorded in this process; not sent to workers
+        self.engine_options = engine_options
+        self.restarts = 0
+        # Spawned, not forked: a forked copy of a running SWI-Prolog is not safe
+        self._context = multiprocessing.get_context('spawn')
+        self._empty = queue.Empty
+        
+        count = workers or os.cpu_count() or 1
+        self._workers = [self._start(index) for index in range(count)]
+        try:
+            for worker in self._workers:
+                worker.wait_ready(startup_timeout)
+        except Exception:
+            for worker in self._workers:
+                worker.stop()
+            raise
+        
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        print(f"✓ Engine pool ready: {count} engines")
+        
+        self._closed = threading.Event()
+        self._health = threading.Thread(
+            target=self._health_loop, args=(health_interval,), name="engine-health", daemon=True
+        )
+        self._health.start()
+    
+    def _start(self, index):
+        return _PoolWorker(index, self._context, self.kb_file, self.engine_options)
+    
+    def _restart(self, worker):
+        """Replace a dead or hung engine with a fresh process"""
+        worker.process.kill()
+        worker.stop()
+        replacement = self._start(worker.index)
+        replacement.wait_ready(self.startup_timeout)
+        self._workers[worker.index] = replacement
+        self.restarts += 1
+        print(f"✓ Restarted engine {worker.index}")
+        return replacement
+    
+    def _call(self, method, *args):
+        """Run a method on the next free engine, waiting for one if all are busy"""
+        if self._closed.is_set():
+            raise RuntimeError("EnginePool is closed")
+        try:
+            worker = self._idle.get(timeout=self.queue_timeout)
+        except self._empty:
+            raise TimeoutError(f"No free engine within {self.queue_timeout} s") from None
+        
+        try:
+            if not worker.process.is_alive():
+                worker = self._restart(worker)
+            try:
+                status, value = worker.request(method, args, self.call_timeout)
+            except TimeoutError:
+                worker = self._restart(worker)
+                raise
+            except (EOFError, OSError) as e:
+                # Crashed mid-call; queries have no side effects, so retry once
+                print(f"Engine {worker.index} crashed ({e!r})")
+                worker = self._restart(worker)
+                status, value = worker.request(method, args, self.call_timeout)
+        finally:
+            self._idle.put(worker)
+        
+        if status == 'error':
+            raise value   # The engine's own exception, e.g. ValueError for bad input
+        return value
+    
+    def _health_loop(self, interval):
+        while not self._closed.wait(interval):
+            # Only engines that are idle right now; busy ones are checked by their caller
+            for _ in range(len(self._workers)):
+                try:
+                    worker = self._idle.get_nowait()
+                except self._empty:
+                    break
+                try:
+                    worker.request('ping', (), min(self.call_timeout, 5.0))
+                except Exception as e:
+                    print(f"Engine {worker.index} failed its health check ({e!r})")
+                    try:
+                        worker = self._restart(worker)
+                    except Exception as e:
+                        print(f"Could not restart engine {worker.index}: {e}")
+                finally:
+                    self._idle.put(worker)
+    
+    def get_recommendations(self, budget, interest, months=None):
+        """Same as TravelExpertSystem.get_recommendations, on a pooled engine"""
+        if self.metrics is None:
+            return self._call('get_recommendations', budget, interest, months)
+        start = time.perf_counter()
+        results = self._call('get_recommendations', budget, interest, months)
+        self.metrics.observe('recommendation_wall_ms', (time.perf_counter() - start) * 1000)
+        self.metrics.observe('recommendation_solutions', len(results))
         return results
+    
+    def get_recommendations_many(self, profiles):
+        return self._call('get_recommendations_many', [tuple(p) for p in profiles])
+    
+    def get_recommendations_multi(self, budget, interests, match='any', months=None):
+        return self._call('get_recommendations_multi', budget, list(interests), match, months)
+    
+    def rank_by_amount(self, amount, interest=None, k=10, weights=None, months=None):
+        return self._call('rank_by_amount', amount, interest, k, weights, months)
+    
+    def visa_info(self, destination):
+        return self._call('visa_info', destination)
+    
+    def search_text(self, query, budget=None, interests=None, match='any', fields=None,
+                    months=None):
+        return self._call('search_text', query, budget, interests and list(interests), match,
+                          fields, months)
+    
+    def stats(self):
+        """Engine count, restarts and calls served per engine"""
+        return {
+            'workers': len(self._workers),
+            'idle': self._idle.qsize(),
+            'restarts': self.restarts,
+            'calls': [worker.calls for worker in self._workers],
+        }
+    
+    @property
+    def kb_version(self):
+        """Changes whenever an engine reloads its KB, e.g. with --watch
+        
+        The content hashes the engines reported with their latest replies;
+        idle engines report through the health check.
+        """
+        return tuple(worker.kb_hash for worker in self._workers)
+    
+    def close(self):
+        """Stop the health thread and every engine process"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._health.join()
+        for worker in self._workers:
+            worker.stop()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RecommendationServer:
+    """Headless HTTP/JSON front end for a TravelExpertSystem or EnginePool
+    
+    GET /recommendations?budget=high&interest=beach[&interest=city&match=all]
+    GET /recommendations?amount=1500&interest=beach[&k=10]
+    (both also take month=12 or month=December, repeatable)
+    GET /search?q=bank+statement+-return[&budget=high&interest=beach&field=documents]
+    GET /visa/<destination>
+    GET /health, GET /metrics (with metrics enabled)
+    
+    Runs on asyncio; Prolog calls go to a thread pool so the event loop
+    never blocks. Connections are kept alive, and responses are cached per
+    knowledge base version.
+    """
+    
+    IDLE_TIMEOUT = 15.0          # Seconds a kept-alive connection may sit idle
+    REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 500: "Internal Server Error"}
+    
+    def __init__(self, engine_factory, host="127.0.0.1", port=8080, threads=1,
+                 cache_size=1024, cache_ttl=60.0, metrics=None):
+        self.engine_factory = engine_factory       # Called on a worker thread
+        self.engine = None
+        self.host = host
+        self.port = port
+        self.metrics = metrics
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()                # key -> (version, expires, status, body)
+        self._inflight = {}                        # key -> asyncio.Future of a running miss
+        # Prolog work runs here; with one engine, a single thread keeps it on one
+        # Prolog thread, like the GUI's search worker
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="prolog-http")
+        _import_asyncio()
+    
+    def _version(self):
+        return getattr(self.engine, 'kb_version', None)
+    
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        self.engine = await loop.run_in_executor(self._executor, self.engine_factory)
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        address = server.sockets[0].getsockname()
+        print(f"✓ Serving recommendations on http://{address[0]}:{address[1]}")
+        async with server:
+            await server.serve_forever()
+    
+    def run(self):
+        """Serve until interrupted"""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._executor.shutdown(wait=False)
+            if hasattr(self.engine, 'close'):
+                self.engine.close()
+            if getattr(self.engine, 'result_cache', None) is not None:
+                self.engine.result_cache.close()
+    
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length', '0').isdigit():
+                    await reader.readexactly(int(headers.get('content-length', '0')))
+                
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    status, body, keep_alive = 400, self._json({'error': "malformed request line"}), False
+                else:
+                    method, target, version = parts
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                                  else connection == 'keep-alive')
+                    start = time.perf_counter()
+                    try:
+                        status, body = await self._respond(method, target)
+                    except Exception as e:
+                        print(f"Request error ({target}): {e}")
+                        status, body = 500, self._json({'error': str(e)})
+                    if self.metrics is not None:
+                        self.metrics.observe('http_request_ms', (time.perf_counter() - start) * 1000)
+                
+                content_type = ("text/plain; version=0.0.4" if body[:1] != b"{"
+                                else "application/json")
+                writer.write(
+                    f"HTTP/1.1 {status} {self.REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    @staticmethod
+    def _json(data):
+        return json.dumps(data, ensure_ascii=False, default=json_default).encode('utf-8')
+    
+    async def _respond(self, method, target):
+        """(status, body) for a request, from the cache when possible"""
+        if method != "GET":
+            return 405, self._json({'error': "only GET is supported"})
+        
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, self._json({'status': "ok", 'kb_version': self._version(),
+                                    'cache': {'entries': len(self._cache), 'hits': self.cache_hits,
+                                              'misses': self.cache_misses}})
+        if url.path == "/metrics" and self.metrics is not None:
+            return 200, self.metrics.to_prometheus().encode('utf-8')
+        
+        key = (url.path, tuple(sorted(parse_qsl(url.query))))
+        version = self._version()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version and cached[1] > time.monotonic():
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached[2], cached[3]
+        
+        # Identical requests arriving together share one Prolog call
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        self.cache_misses += 1
+        pending = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._compute(url.path, key[1])
+            pending.set_result(result)
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+        
+        if result[0] in (200, 404):
+            self._cache[key] = (version, time.monotonic() + self.cache_ttl) + result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+    
+    async def _compute(self, path, params_list):
+        """Run the Prolog call behind a request on the thread pool"""
+        loop = asyncio.get_running_loop()
+        params = dict(params_list)
+        interests = [v for k, v in params_list if k == 'interest']
+        months = [int(v) if v.isdigit() else v for k, v in params_list if k == 'month'] or None
+        if months is not None:
+            try:
+                month_bits(months)
+            except ValueError as e:
+                return 400, self._json({'error': str(e)})
+        
+        if path.startswith("/visa/"):
+            destination = unquote(path[len("/visa/"):])
+            info = await loop.run_in_executor(self._executor, self.engine.visa_info, destination)
+            if info is None:
+                return 404, self._json({'error': f"unknown destination {destination!r}"})
+            return 200, self._json(info)
+        
+        if path == "/search":
+            fields = [v for k, v in params_list if k == 'field'] or None
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self.engine.search_text, params.get('q', ''),
+                    params.get('budget'), interests, params.get('match', 'any'), fields, months)
+            except ValueError as e:
+                return 400, self._json({'error': str(e)})
+            return 200, self._json({'count': len(results), 'results': results})
+        
+        if path != "/recommendations":
+            return 404, self._json({'error': f"no such endpoint {path!r}"})
+        if not interests:
+            return 400, self._json({'error': "at least one interest is required"})
+        match = params.get('match', 'any')
+        if match not in ('any', 'all'):
+            return 400, self._json({'error': "match must be 'any' or 'all'"})
+        
+        if 'amount' in params:
+            try:
+                amount, k = float(params['amount']), int(params.get('k', 10))
+                if not math.isfinite(amount):
+                    raise ValueError(amount)
+            except ValueError:
+                return 400, self._json({'error': "amount must be a finite number and k an integer"})
+            call = (self.engine.rank_by_amount, amount, interests, k, None, months)
+        elif 'budget' not in params:
+            return 400, self._json({'error': "budget or amount is required"})
+        elif len(interests) == 1:
+            call = (self.engine.get_recommendations, params['budget'], interests[0], months)
+        else:
+            call = (self.engine.get_recommendations_multi, params['budget'], interests, match, months)
+        
+        results = await loop.run_in_executor(self._executor, *call)
+        return 200, self._json({'count': len(results), 'results': results})
+
+
+def read_profiles(path, fmt=None):
+    """Yield traveller profiles from a CSV or JSONL file ('-' for stdin), one at a time
+    
+    Each profile is a dict with 'budget' and 'interest', and optionally 'amount'
+    (exact USD) and 'id'. A JSONL line that does not parse is yielded as its
+    ValueError instead, so one bad row does not end the batch. The format
+    comes from the file extension unless given.
+    """
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    f = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+    try:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield e
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _score_chunk(engine, chunk):
+    """Output records for one chunk of (line, profile) pairs
+    
+    Level profiles go to get_recommendations_many in one call; exact amounts
+    go to rank_by_amount, once per distinct (amount, interest). Rows whose
+    query raised get an 'error' record instead of empty destinations.
+    """
+    records = []
+    levels, amounts = [], {}
+    for line, profile in chunk:
+        record = {'line': line}
+        try:
+            if isinstance(profile, ValueError):
+                raise profile   # Unreadable line, from read_profiles
+            if profile.get('id') not in (None, ''):
+                record['id'] = profile['id']
+            record['interest'] = profile['interest']
+            if profile.get('amount') not in (None, ''):
+                record['amount'] = float(profile['amount'])
+                if not math.isfinite(record['amount']):
+                    raise ValueError("amount must be a finite number")
+            else:
+                record['budget'] = profile['budget']
+            if '' in (record['interest'], record.get('budget')):
+                raise ValueError("budget and interest must not be empty")
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            record = {'line': line, 'error': f"invalid profile: {e!r}"}
+        else:
+            if 'amount' in record:
+                amounts[(record['amount'], record['interest'])] = None
+            else:
+                levels.append((record['budget'], record['interest']))
+        records.append(record)
+    
+    try:
+        level_results = dict(zip(levels, engine.get_recommendations_many(levels))) if levels else {}
+    except Exception as e:
+        level_results = dict.fromkeys(levels, e)
+    for key in amounts:
+        try:
+            amounts[key] = engine.rank_by_amount(*key)
+        except Exception as e:
+            amounts[key] = e
+    
+    for i, record in enumerate(records):
+        if 'error' in record:
+            continue
+        if 'amount' in record:
+            results = amounts[(record['amount'], record['interest'])]
+        else:
+            results = level_results[(record['budget'], record['interest'])]
+        if isinstance(results, Exception):
+            records[i] = {'line': record['line'], 'error': f"query failed: {results!r}"}
+        elif 'amount' in record:
+            record['destinations'] = [row['destination'] for row in results]
+            record['scores'] = [round(row['score'], 4) for row in results]
+        else:
+            record['destinations'] = [dest['destination'] for dest in results]
+    return records
+
+
+def score_profiles(engine, profiles, out, chunk_size=5000, parallel=1):
+    """Write one JSONL recommendation record per profile to `out`, in input order
+    
+    Profiles are read `chunk_size` at a time, and at most 2 * `parallel` chunks
+    are in flight, so memory stays bounded however long the input is. With an
+    EnginePool, `parallel` should match its worker count. Returns counters.
+    """
+    stats = {'profiles': 0, 'errors': 0, 'chunks': 0, 'seconds': 0.0}
+    start = time.perf_counter()
+    numbered = enumerate(profiles, 1)
+    pending = deque()
+    
+    def write(records):
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False, default=json_default))
+            out.write("\n")
+            stats['errors'] += 'error' in record
+        stats['profiles'] += len(records)
+        stats['chunks'] += 1
+    
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        while True:
+            chunk = list(islice(numbered, chunk_size))
+            if chunk:
+                pending.append(executor.submit(_score_chunk, engine, chunk))
+            # Write finished chunks in order, waiting once the window is full
+            while pending and (len(pending) >= 2 * parallel or not chunk or pending[0].done()):
+                write(pending.popleft().result())
+            if not chunk:
+                break
+    
+    stats['seconds'] = time.perf_counter() - start
+    stats['profiles_per_second'] = stats['profiles'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
 
 
 class TravelGUI:
@@ -84,17 +2424,96 @@ class TravelGUI:
         'warning': '⚠',
     }
     
-    def __init__(self):
+    # Frames for the loading label while a search runs in the background
+    SPINNER = ['◐', '◓', '◑', '◒']
+    SEARCH_POLL_MS = 50
+    STREAM_POLL_MS = 16          # Faster polling while results are arriving
+    RANK_TOP_K = 10              # Destinations shown for an exact-amount search
+    ANY_MONTH = "Any month"
+    
+    ENGINE_POLL_MS = 100
+    
+    def __init__(self, kb_file="travel_kb.pl", lazy=False, **engine_options):
+        """Build the window; with lazy=True the KB loads after the first paint
+        
+        engine_options (materialize, snapshot, watch, metrics, backend,
+        result_cache, result_cache_mb) are passed to TravelExpertSystem.
+        """
+        self.kb_file = kb_file
+        self.engine_options = engine_options
+        self.metrics = engine_options.get('metrics')
+        self._search_started = None
+        self.expert_system = None
+        self.startup_timings = {}
+        
+        start = time.perf_counter()
+        _import_gui()
+        self.startup_timings['import_gui'] = time.perf_counter() - start
+        
+        if not lazy:
+            self._start_engine()
+            self._check_engine_error()
+        
+        # Prolog runs on a single worker so the Tk mainloop never blocks on it
+        self._search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prolog-search")
+        self._inflight = {}        # Search key -> Future still queued or running
+        self._active_search = None # (key, future) whose results will be shown
+        self._active_stream = None # ResultStream of the active search, if it streams
+        self._spinner_index = 0
+        
+        self.setup_ui()
+        self.root.update()
+        self.startup_timings['first_paint'] = time.perf_counter() - _PROCESS_START
+        
+        if lazy:
+            # Load on the search worker: SWI-Prolog is then initialised on a
+            # thread that lives as long as the app, and searches queue behind it
+            self.search_btn.configure(state="disabled", text="Loading knowledge base...")
+            loading = self._search_executor.submit(self._start_engine)
+            self.root.after(self.ENGINE_POLL_MS, self._poll_engine, loading)
+        else:
+            self._log_startup()
+    
+    def _start_engine(self):
+        """Start Prolog and consult the KB; errors are reported on the Tk thread"""
+        self._engine_error = None
         try:
-            self.expert_system = TravelExpertSystem("travel_kb.pl")
-        except FileNotFoundError as e:
-            messagebox.showerror("Error", str(e))
-            sys.exit(1)
+            self.expert_system = TravelExpertSystem(self.kb_file, **self.engine_options)
         except Exception as e:
+            self._engine_error = e
+    
+    def _check_engine_error(self):
+        """Show an engine startup failure and exit"""
+        e = self._engine_error
+        if e is None:
+            return
+        if isinstance(e, FileNotFoundError):
+            messagebox.showerror("Error", str(e))
+        else:
             messagebox.showerror("Error", f"Failed to initialize system: {e}")
-            sys.exit(1)
+        sys.exit(1)
+    
+    def _poll_engine(self, loading):
+        """Enable searching once the background KB load has finished"""
+        if not loading.done():
+            self.root.after(self.ENGINE_POLL_MS, self._poll_engine, loading)
+            return
         
-        self.setup_ui()
+        self._check_engine_error()
+        self.search_btn.configure(state="normal", text=f"{self.ICONS['search']}  Find Destinations")
+        self._log_startup()
+    
+    def _log_startup(self):
+        """Print where startup time went"""
+        timings = dict(self.startup_timings)
+        timings.update(self.expert_system.timings)
+        phases = [
+            ("imports", timings['import_gui'] + timings['import_pyswip']),
+            ("engine init", timings['engine_init']),
+            ("consult", timings['consult']),
+            ("first paint", timings['first_paint']),
+        ]
+        print("✓ Startup: " + " | ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in phases))
     
     def setup_ui(self):
         """Setup the Material Design GUI"""
@@ -105,6 +2524,7 @@ class TravelGUI:
         self.root.title("Travel & Visa Consultant")
         self.root.geometry("1000x800")
         self.root.configure(fg_color=self.COLORS['background'])
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Main Container with padding
         main_container = ctk.CTkFrame(self.root, fg_color=self.COLORS['background'])
@@ -129,6 +2549,7 @@ class TravelGUI:
             fg_color=self.COLORS['background']
         )
         self.results_container.pack(fill="both", expand=True, pady=10)
+        self._create_results_area(self.results_container)
         
         # Footer
         self._create_footer(main_container)
@@ -221,6 +2642,29 @@ class TravelGUI:
             self._create_option_button(budget_container, title, desc, 
                                       self.budget_var, value, i)
         
+        # Exact amount: ranks destinations instead of filtering by level
+        amount_row = ctk.CTkFrame(card_content, fg_color="transparent")
+        amount_row.pack(fill="x", padx=5, pady=(0, 10))
+        
+        amount_label = ctk.CTkLabel(
+            amount_row,
+            text="Or enter an exact budget (USD) for a ranked top 10:",
+            font=("Segoe UI", 13),
+            text_color=self.COLORS['text_secondary']
+        )
+        amount_label.pack(side="left", padx=(0, 10))
+        
+        self.amount_entry = ctk.CTkEntry(
+            amount_row,
+            placeholder_text="e.g. 1500",
+            font=("Segoe UI", 13),
+            width=160,
+            height=36,
+            corner_radius=10
+        )
+        self.amount_entry.pack(side="left")
+        self.amount_entry.bind("<Return>", lambda event: self.search_destinations())
+        
         # Separator
         separator = ctk.CTkFrame(card_content, height=2, fg_color=self.COLORS['background'])
         separator.pack(fill="x", pady=20)
@@ -245,10 +2689,9 @@ class TravelGUI:
         )
         interest_title.pack(side="left")
         
-        # Interest Options
-        self.interest_var = ctk.StringVar(value="beach")
+        # Interest Options: any number can be selected
         interest_container = ctk.CTkFrame(card_content, fg_color="transparent")
-        interest_container.pack(fill="x", pady=(0, 20))
+        interest_container.pack(fill="x", pady=(0, 10))
         
         interests = [
             (self.ICONS['beach'], "Beach Paradise", "beach"),
@@ -258,12 +2701,62 @@ class TravelGUI:
             (self.ICONS['city'], "City Exploration", "city")
         ]
         
+        self.interest_vars = {}
         for i, (icon, title, value) in enumerate(interests):
+            self.interest_vars[value] = ctk.BooleanVar(value=(value == "beach"))
             self._create_interest_chip(interest_container, icon, title, 
-                                      self.interest_var, value, i)
+                                      self.interest_vars[value], i)
+        
+        # How several selected interests combine
+        match_row = ctk.CTkFrame(card_content, fg_color="transparent")
+        match_row.pack(fill="x", padx=5, pady=(0, 20))
+        
+        match_label = ctk.CTkLabel(
+            match_row,
+            text="With several interests, show destinations offering:",
+            font=("Segoe UI", 13),
+            text_color=self.COLORS['text_secondary']
+        )
+        match_label.pack(side="left", padx=(0, 10))
+        
+        self.match_var = ctk.StringVar(value="any")
+        match_selector = ctk.CTkSegmentedButton(
+            match_row,
+            values=["any", "all"],
+            variable=self.match_var,
+            font=("Segoe UI", 13),
+            selected_color=self.COLORS['primary'],
+            selected_hover_color=self.COLORS['primary_dark']
+        )
+        match_selector.pack(side="left")
+        
+        # Travel month: only destinations in season then
+        month_row = ctk.CTkFrame(card_content, fg_color="transparent")
+        month_row.pack(fill="x", padx=5, pady=(0, 20))
+        
+        month_label = ctk.CTkLabel(
+            month_row,
+            text="Travelling in:",
+            font=("Segoe UI", 13),
+            text_color=self.COLORS['text_secondary']
+        )
+        month_label.pack(side="left", padx=(0, 10))
+        
+        self.month_var = ctk.StringVar(value=self.ANY_MONTH)
+        month_selector = ctk.CTkOptionMenu(
+            month_row,
+            values=[self.ANY_MONTH, *MONTHS],
+            variable=self.month_var,
+            font=("Segoe UI", 13),
+            width=160,
+            fg_color=self.COLORS['primary'],
+            button_color=self.COLORS['primary_dark'],
+            button_hover_color=self.COLORS['primary_dark']
+        )
+        month_selector.pack(side="left")
         
         # Search Button
-        search_btn = ctk.CTkButton(
+        self.search_btn = ctk.CTkButton(
             card_content,
             text=f"{self.ICONS['search']}  Find Destinations",
             command=self.search_destinations,
@@ -273,7 +2766,7 @@ class TravelGUI:
             hover_color="#E55D50",
             corner_radius=25
         )
-        search_btn.pack(fill="x", pady=(10, 0))
+        self.search_btn.pack(fill="x", pady=(10, 0))
     
     def _create_option_button(self, parent, title, desc, variable, value, index):
         """Create a material-style option button"""
@@ -311,14 +2804,14 @@ class TravelGUI:
         
         variable.trace_add('write', update_style)
     
-    def _create_interest_chip(self, parent, icon, title, variable, value, index):
-        """Create interest selection chips"""
-        is_selected = variable.get() == value
+    def _create_interest_chip(self, parent, icon, title, variable, index):
+        """Create an interest chip that toggles a BooleanVar"""
+        is_selected = variable.get()
         
         chip = ctk.CTkButton(
             parent,
             text=f"{icon}  {title}",
-            command=lambda: variable.set(value),
+            command=lambda: variable.set(not variable.get()),
             font=("Segoe UI", 13),
             height=45,
             fg_color=self.COLORS['primary'] if is_selected else self.COLORS['background'],
@@ -331,7 +2824,7 @@ class TravelGUI:
         chip.pack(side="left", padx=5, fill="x", expand=True)
         
         def update_style(*args):
-            is_sel = variable.get() == value
+            is_sel = variable.get()
             chip.configure(
                 fg_color=self.COLORS['primary'] if is_sel else self.COLORS['background'],
                 text_color="white" if is_sel else self.COLORS['text_primary'],
@@ -354,54 +2847,223 @@ class TravelGUI:
         footer_text.pack()
     
     def search_destinations(self):
-        """Search for destinations and display as cards"""
-        budget = self.budget_var.get()
-        interest = self.interest_var.get()
-        
-        # Clear previous results
-        for widget in self.results_container.winfo_children():
-            widget.destroy()
-        
-        # Loading indicator
-        loading = ctk.CTkLabel(
-            self.results_container,
-            text=f"{self.ICONS['search']}  Searching for destinations...",
-            font=("Segoe UI", 14),
-            text_color=self.COLORS['text_secondary']
-        )
-        loading.pack(pady=20)
-        self.root.update()
+        """Start a background search; a newer search supersedes one still in flight"""
+        key = self._search_key()
+        if key is None:
+            return
         
-        results = self.expert_system.get_recommendations(budget, interest)
+        if self._active_search is not None:
+            active_key, active_future = self._active_search
+            if active_key == key and not active_future.done():
+                return  # Same search already running, e.g. a double click
+            if active_key != key:
+                # Drop it if the worker has not picked it up yet; otherwise its
+                # result is simply ignored when it arrives
+                if active_future.cancel():
+                    self._inflight.pop(active_key, None)
+                if self._active_stream is not None:
+                    self._active_stream.cancelled.set()
+        
+        stream = None
+        mode, _, interests, _, month = key
+        if mode == 'level' and len(interests) == 1 and month is None:
+            # A plain Prolog query: stream it so the first card shows up early
+            stream = ResultStream()
+            future = self._search_executor.submit(self._stream_search, key, stream)
+        else:
+            future = self._inflight.get(key)
+            if future is None or future.cancelled():
+                future = self._search_executor.submit(self._run_search, key)
+                self._inflight[key] = future
+                future.add_done_callback(lambda f, key=key: self._forget_search(key, f))
+        self._active_search = (key, future)
+        self._active_stream = stream
+        if self.metrics is not None:
+            self._search_started = time.perf_counter()
+        
+        self._show_loading()
+        self.root.after(self.STREAM_POLL_MS if stream else self.SEARCH_POLL_MS,
+                        self._poll_search, key, future, stream)
+    
+    def _search_key(self):
+        """Describe the search on the input card, or None if the input is invalid"""
+        interests = tuple(name for name, var in self.interest_vars.items() if var.get())
+        if not interests:
+            messagebox.showwarning("No Interest Selected", "Select at least one interest.")
+            return None
+        match = self.match_var.get()
+        month = self.month_var.get()
+        month = MONTHS.index(month) + 1 if month in MONTHS else None
+        amount = self.amount_entry.get().strip().lstrip('$').replace(',', '')
+        if not amount:
+            return ('level', self.budget_var.get(), interests, match, month)
+        try:
+            amount = float(amount)
+        except ValueError:
+            amount = 0
+        if not math.isfinite(amount) or amount <= 0:
+            messagebox.showwarning(
+                "Invalid Budget",
+                "Enter your budget as a positive number of US dollars,\n"
+                "or leave it empty to search by budget level."
+            )
+            return None
+        return ('amount', amount, interests, match, month)
+    
+    def _run_search(self, key):
+        """Answer a search key; runs on the search worker"""
+        mode, budget, interests, match, month = key
+        if mode == 'amount':
+            return self.expert_system.rank_by_amount(budget, interests, k=self.RANK_TOP_K,
+                                                     months=month)
+        if len(interests) == 1:
+            return self.expert_system.get_recommendations(budget, interests[0], months=month)
+        return self.expert_system.get_recommendations_multi(budget, interests, match, months=month)
+    
+    def _stream_search(self, key, stream):
+        """Hand results to `stream` as Prolog finds them; runs on the search worker"""
+        _, budget, interests, _, _ = key
+        results = []
+        recommendations = self.expert_system.iter_recommendations(budget, interests[0])
+        try:
+            for dest in recommendations:
+                if stream.cancelled.is_set():
+                    break  # Superseded; close() below ends the Prolog query
+                stream.pending.append(dest)
+                results.append(dest)
+        finally:
+            recommendations.close()
+        return results
+    
+    def _forget_search(self, key, future):
+        """Drop a finished future from the in-flight map (runs on the worker thread)"""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+    
+    def _show_loading(self):
+        """Show the loading label above the current results"""
+        self._no_results_card.pack_forget()
+        self._results_header.pack_forget()
+        self._loading_label.configure(text=f"{self.ICONS['search']}  Searching for destinations...")
+        self._loading_label.pack(pady=20, before=self.results_view.body)
+    
+    def _poll_search(self, key, future, stream=None):
+        """Animate the loading label until the worker hands back results
+        
+        A streaming search also shows whatever results arrived since the
+        last poll, so cards appear while Prolog is still searching.
+        """
+        if self._active_search != (key, future):
+            return  # Superseded by a newer search, which has its own poll loop
+        
+        if stream is not None:
+            self._drain_stream(stream)
+        
+        if not future.done():
+            self._spinner_index = (self._spinner_index + 1) % len(self.SPINNER)
+            found = f" ({stream.count} found so far)" if stream is not None and stream.count else ""
+            self._loading_label.configure(
+                text=f"{self.SPINNER[self._spinner_index]}  Searching for destinations...{found}"
+            )
+            self.root.after(self.STREAM_POLL_MS if stream else self.SEARCH_POLL_MS,
+                            self._poll_search, key, future, stream)
+            return
+        
+        self._active_search = None
+        self._active_stream = None
+        self._loading_label.pack_forget()
+        
+        try:
+            results = future.result()
+        except Exception as e:
+            print(f"Search failed: {e}")
+            results = []
         
-        # Remove loading
-        loading.destroy()
+        if stream is None:
+            self._show_results(results)
+            return
+        
+        # The worker may have appended its last results after the drain above
+        self._drain_stream(stream)
+        if not stream.count:
+            self.results_view.set_items([])   # Clear the previous search's cards
+        total_ms = (time.perf_counter() - stream.started) * 1000
+        first = f"first card after {stream.first_ms:.1f} ms, " if stream.count else ""
+        print(f"✓ Streamed {stream.count} results: {first}done after {total_ms:.1f} ms "
+              f"({self.results_view.pool_size} cards in pool)")
+        self._show_summary(self.results_view.items)
+    
+    def _drain_stream(self, stream):
+        """Append the results the worker has found since the last poll"""
+        batch = []
+        while stream.pending:
+            batch.append(stream.pending.popleft())
+        if not batch:
+            return
+        
+        if stream.count == 0:
+            # First batch replaces the previous search's cards
+            self.results_view.set_items(batch)
+            stream.first_ms = (time.perf_counter() - stream.started) * 1000
+            if self.metrics is not None:
+                self.metrics.observe('first_result_ms', stream.first_ms)
+        else:
+            self.results_view.append_items(batch)
+        stream.count += len(batch)
+        if self.metrics is not None:
+            self.metrics.observe('render_ms', self.results_view.last_render_ms)
+    
+    def _show_results(self, results):
+        """Reconcile the result cards with a new set of results"""
+        # Cards are keyed by destination, so only what changed is touched
+        self.results_view.set_items(results)
+        print(f"✓ Rendered {len(results)} results in {self.results_view.last_render_ms:.1f} ms "
+              f"({self.results_view.pool_size} cards in pool, {self.results_view.last_changes})")
+        if self.metrics is not None:
+            self.metrics.observe('render_ms', self.results_view.last_render_ms)
+        self._show_summary(results)
+    
+    def _show_summary(self, results):
+        """Show the "Found N" header, or the no-results card"""
+        if self.metrics is not None and self._search_started is not None:
+            self.metrics.observe('search_wall_ms', (time.perf_counter() - self._search_started) * 1000)
+            self._search_started = None
         
         if not results:
-            self._show_no_results()
+            self._no_results_card.pack(fill="x", pady=10, padx=5)
             return
         
-        # Results header
-        header = ctk.CTkLabel(
-            self.results_container,
-            text=f"{self.ICONS['check']}  Found {len(results)} Perfect Destination{'s' if len(results) > 1 else ''} for You",
+        self._results_header.configure(
+            text=f"{self.ICONS['check']}  Found {len(results)} Perfect Destination{'s' if len(results) > 1 else ''} for You"
+        )
+        self._results_header.pack(pady=(10, 20), before=self.results_view.body)
+    
+    def _create_results_area(self, parent):
+        """Create the results widgets once; searches only show or hide them"""
+        self._loading_label = ctk.CTkLabel(
+            parent,
+            text="",
+            font=("Segoe UI", 14),
+            text_color=self.COLORS['text_secondary']
+        )
+        
+        self._results_header = ctk.CTkLabel(
+            parent,
+            text="",
             font=("Segoe UI", 20, "bold"),
             text_color=self.COLORS['success']
         )
-        header.pack(pady=(10, 20))
         
-        # Display destination cards
-        for dest in results:
-            self._create_destination_card(self.results_container, dest)
+        self.results_view = VirtualResultsView(self, parent, self.content_frame)
+        self._no_results_card = self._create_no_results_card(parent)
     
-    def _show_no_results(self):
-        """Show no results message"""
+    def _create_no_results_card(self, parent):
+        """Create the no results message; the caller packs it"""
         no_results_card = ctk.CTkFrame(
-            self.results_container,
+            parent,
             fg_color=self.COLORS['card'],
             corner_radius=15
         )
-        no_results_card.pack(fill="x", pady=10, padx=5)
         
         content = ctk.CTkFrame(no_results_card, fg_color="transparent")
         content.pack(pady=40, padx=30)
@@ -429,96 +3091,16 @@ class TravelGUI:
             text_color=self.COLORS['text_secondary']
         )
         subtitle.pack(pady=(5, 0))
+        return no_results_card
     
     def _create_destination_card(self, parent, dest):
-        """Create a beautiful card for each destination"""
-        card = ctk.CTkFrame(
-            parent,
-            fg_color=self.COLORS['card'],
-            corner_radius=15,
-            border_width=0
-        )
-        card.pack(fill="x", pady=10, padx=5)
-        
-        # Card content
-        content = ctk.CTkFrame(card, fg_color="transparent")
-        content.pack(fill="x", padx=25, pady=20)
-        
-        # Header with destination name
-        header_frame = ctk.CTkFrame(content, fg_color=self.COLORS['primary'], corner_radius=10)
-        header_frame.pack(fill="x", pady=(0, 15))
-        
-        dest_name = ctk.CTkLabel(
-            header_frame,
-            text=f"{self.ICONS['location']}  {dest['destination'].upper()}",
-            font=("Segoe UI", 22, "bold"),
-            text_color="white"
-        )
-        dest_name.pack(pady=12)
-        
-        # Info grid
-        info_grid = ctk.CTkFrame(content, fg_color="transparent")
-        info_grid.pack(fill="x", pady=10)
-        
-        # Budget info
-        self._create_info_row(
-            info_grid,
-            self.ICONS['money'],
-            "Minimum Budget",
-            f"${dest['min_budget']} USD",
-            0
-        )
-        
-        # Visa status
-        visa_text = dest['visa_status'].replace('_', ' ').title()
-        visa_color = self._get_visa_color(dest['visa_status'])
-        self._create_info_row(
-            info_grid,
-            self.ICONS['visa'],
-            "Visa Status",
-            visa_text,
-            1,
-            value_color=visa_color
-        )
-        
-        # Best season
-        self._create_info_row(
-            info_grid,
-            self.ICONS['calendar'],
-            "Best Season",
-            dest['best_season'],
-            2
-        )
-        
-        # Documents section
-        docs_frame = ctk.CTkFrame(content, fg_color=self.COLORS['background'], corner_radius=10)
-        docs_frame.pack(fill="x", pady=(15, 0))
-        
-        docs_content = ctk.CTkFrame(docs_frame, fg_color="transparent")
-        docs_content.pack(fill="x", padx=15, pady=15)
-        
-        docs_header = ctk.CTkLabel(
-            docs_content,
-            text=f"{self.ICONS['document']}  Required Documents",
-            font=("Segoe UI", 14, "bold"),
-            text_color=self.COLORS['text_primary'],
-            anchor="w"
-        )
-        docs_header.pack(fill="x", pady=(0, 8))
-        
-        docs_text = ctk.CTkLabel(
-            docs_content,
-            text=dest['documents'],
-            font=("Segoe UI", 12),
-            text_color=self.COLORS['text_secondary'],
-            wraplength=800,
-            justify="left",
-            anchor="w"
-        )
-        docs_text.pack(fill="x")
+        """Create a card for a destination; the caller lays it out"""
+        card = DestinationCard(self, parent, VirtualResultsView.CARD_HEIGHT)
+        card.bind(dest)
+        return card
     
     def _create_info_row(self, parent, icon, label, value, row, value_color=None):
-        """Create an info row in the card"""
+        """Create an info row in the card and return its value label"""
         row_frame = ctk.CTkFrame(parent, fg_color="transparent")
         row_frame.grid(row=row, column=0, sticky="ew", pady=8, padx=5)
         parent.grid_columnconfigure(0, weight=1)
@@ -551,6 +3133,7 @@ class TravelGUI:
             text_color=value_color or self.COLORS['text_primary']
         )
         value_label.pack(side="right")
+        return value_label
     
     def _get_visa_color(self, visa_status):
         """Get color based on visa difficulty"""
@@ -562,14 +3145,345 @@ class TravelGUI:
         }
         return colors.get(visa_status, self.COLORS['text_primary'])
     
+    def _on_close(self):
+        """Stop the search worker and close the window"""
+        for future in list(self._inflight.values()):
+            future.cancel()
+        if self._active_stream is not None:
+            self._active_stream.cancelled.set()
+        self._search_executor.shutdown(wait=False)
+        self.root.destroy()
+    
     def run(self):
         """Start the GUI"""
         self.root.mainloop()
 
 
+class DestinationCard:
+    """Destination card whose widgets are built once and rebound to new data"""
+    
+    def __init__(self, gui, parent, height):
+        self.gui = gui
+        self.destination = None
+        self.row = None              # Row index it is placed at, None when hidden
+        
+        self.frame = ctk.CTkFrame(
+            parent,
+            height=height,
+            fg_color=gui.COLORS['card'],
+            corner_radius=15,
+            border_width=0
+        )
+        # Fixed height so the results view can compute row offsets
+        self.frame.pack_propagate(False)
+        
+        # Card content
+        content = ctk.CTkFrame(self.frame, fg_color="transparent")
+        content.pack(fill="x", padx=25, pady=20)
+        
+        # Header with destination name
+        header_frame = ctk.CTkFrame(content, fg_color=gui.COLORS['primary'], corner_radius=10)
+        header_frame.pack(fill="x", pady=(0, 15))
+        
+        self.name_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=("Segoe UI", 22, "bold"),
+            text_color="white"
+        )
+        self.name_label.pack(pady=12)
+        
+        # Info grid
+        info_grid = ctk.CTkFrame(content, fg_color="transparent")
+        info_grid.pack(fill="x", pady=10)
+        
+        self.budget_label = gui._create_info_row(
+            info_grid, gui.ICONS['money'], "Minimum Budget", "", 0
+        )
+        self.visa_label = gui._create_info_row(
+            info_grid, gui.ICONS['visa'], "Visa Status", "", 1
+        )
+        self.season_label = gui._create_info_row(
+            info_grid, gui.ICONS['calendar'], "Best Season", "", 2
+        )
+        
+        # Documents section
+        docs_frame = ctk.CTkFrame(content, fg_color=gui.COLORS['background'], corner_radius=10)
+        docs_frame.pack(fill="x", pady=(15, 0))
+        
+        docs_content = ctk.CTkFrame(docs_frame, fg_color="transparent")
+        docs_content.pack(fill="x", padx=15, pady=15)
+        
+        docs_header = ctk.CTkLabel(
+            docs_content,
+            text=f"{gui.ICONS['document']}  Required Documents",
+            font=("Segoe UI", 14, "bold"),
+            text_color=gui.COLORS['text_primary'],
+            anchor="w"
+        )
+        docs_header.pack(fill="x", pady=(0, 8))
+        
+        self.docs_label = ctk.CTkLabel(
+            docs_content,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=gui.COLORS['text_secondary'],
+            wraplength=800,
+            justify="left",
+            anchor="w"
+        )
+        self.docs_label.pack(fill="x")
+    
+    def bind(self, dest):
+        """Show a destination's details in this card"""
+        gui = self.gui
+        self.destination = dest
+        self.name_label.configure(text=f"{gui.ICONS['location']}  {dest['destination'].upper()}")
+        self.budget_label.configure(text=f"${dest['min_budget']} USD")
+        self.visa_label.configure(
+            text=dest['visa_status'].replace('_', ' ').title(),
+            text_color=gui._get_visa_color(dest['visa_status'])
+        )
+        self.season_label.configure(text=dest['best_season'])
+        self.docs_label.configure(text=dest['documents'])
+
+
+class ResultStream:
+    """Results passed from the search worker to the Tk thread as they are found"""
+    
+    def __init__(self):
+        self.pending = deque()               # Appended by the worker, drained by Tk
+        self.cancelled = threading.Event()   # Set when a newer search supersedes this one
+        self.started = time.perf_counter()
+        self.count = 0                       # Results drained so far
+        self.first_ms = None                 # Time until the first card was shown
+
+
+class VirtualResultsView:
+    """Result list that only materializes the cards in view, keyed by destination"""
+    
+    ROW_HEIGHT = 400                 # Unscaled pixels per result, including the gap
+    CARD_HEIGHT = ROW_HEIGHT - 20
+    OVERSCAN = 2                     # Extra rows kept above and below the viewport
+    
+    def __init__(self, gui, parent, scrollable):
+        self.gui = gui
+        self.items = []
+        self.keys = []
+        self._key_counts = {}        # Destination -> times keyed, for append_items
+        self.last_render_ms = 0.0
+        self.last_changes = {}
+        self._cards = []             # Every card ever built
+        self._placed = {}            # Key -> card currently on screen
+        # Hidden cards, oldest first, still bound to their last destination so
+        # one that comes back needs no rebind
+        self._spare = OrderedDict()
+        self._refresh_pending = False
+        
+        self.body = ctk.CTkFrame(parent, fg_color="transparent", height=1)
+        self.body.pack(fill="x", padx=5)
+        
+        # CTkScrollableFrame does not expose scroll events, so wrap the
+        # canvas' scroll callback to hear about every viewport change
+        self._canvas = scrollable._parent_canvas
+        scrollbar = scrollable._scrollbar
+        
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            self._schedule_refresh()
+        
+        self._canvas.configure(yscrollcommand=on_scroll)
+        self._canvas.bind("<Configure>", lambda event: self._schedule_refresh(), add="+")
+    
+    @property
+    def pool_size(self):
+        return len(self._cards)
+    
+    @staticmethod
+    def _keys_for(items, seen):
+        """Destination atoms, disambiguated if a destination appears twice
+        
+        `seen` counts the destinations keyed so far and is updated in place,
+        so appended items continue the numbering.
+        """
+        keys = []
+        for dest in items:
+            atom = dest['destination']
+            count = seen.get(atom, 0)
+            seen[atom] = count + 1
+            keys.append(atom if count == 0 else (atom, count))
+        return keys
+    
+    def set_items(self, items):
+        """Reconcile the displayed cards with a new result list"""
+        start = time.perf_counter()
+        self.items = list(items)
+        self._key_counts = {}
+        self.keys = self._keys_for(self.items, self._key_counts)
+        
+        self.body.configure(height=max(1, len(self.items) * self.ROW_HEIGHT))
+        self.last_changes = self._refresh()
+        self.body.update_idletasks()
+        self.last_render_ms = (time.perf_counter() - start) * 1000
+    
+    def append_items(self, items):
+        """Add results after the current ones, e.g. while a search streams in"""
+        start = time.perf_counter()
+        items = list(items)
+        self.items.extend(items)
+        self.keys.extend(self._keys_for(items, self._key_counts))
+        
+        self.body.configure(height=max(1, len(self.items) * self.ROW_HEIGHT))
+        self.last_changes = self._refresh()
+        self.body.update_idletasks()
+        self.last_render_ms = (time.perf_counter() - start) * 1000
+    
+    def _schedule_refresh(self):
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.body.after_idle(self._refresh)
+    
+    def _visible_range(self):
+        """Row indices intersecting the viewport, plus overscan"""
+        if not self.items:
+            return range(0)
+        row_px = self.ROW_HEIGHT * self.body._get_widget_scaling()
+        top = self._canvas.winfo_rooty() - self.body.winfo_rooty()
+        bottom = top + self._canvas.winfo_height()
+        first = max(0, int(top // row_px) - self.OVERSCAN)
+        last = min(len(self.items), int(bottom // row_px) + 1 + self.OVERSCAN)
+        return range(first, max(first, last))
+    
+    def _refresh(self):
+        """Keep cards whose destination is still in view, recycle the rest"""
+        self._refresh_pending = False
+        wanted = {self.keys[index]: index for index in self._visible_range()}
+        changes = {'kept': 0, 'moved': 0, 'added': 0, 'removed': 0}
+        
+        for key in [k for k in self._placed if k not in wanted]:
+            card = self._placed.pop(key)
+            card.frame.place_forget()
+            card.row = None
+            self._spare[key] = card
+            changes['removed'] += 1
+        
+        # Hidden cards still bound to a wanted destination are claimed first,
+        # so recycling below never steals a card that would have matched
+        revived = [k for k in wanted if k not in self._placed and k in self._spare]
+        for key in revived:
+            self._placed[key] = self._spare.pop(key)
+        
+        for key, index in wanted.items():
+            dest = self.items[index]
+            card = self._placed.get(key)
+            if card is None:
+                if self._spare:
+                    _, card = self._spare.popitem(last=False)
+                else:
+                    card = self.gui._create_destination_card(self.body, dest)
+                    self._cards.append(card)
+                self._placed[key] = card
+                changes['added'] += 1
+            elif card.row is None:
+                changes['added'] += 1
+            elif card.row == index:
+                changes['kept'] += 1
+            else:
+                changes['moved'] += 1
+            
+            if card.destination != dest:
+                card.bind(dest)
+            if card.row != index:
+                card.frame.place(x=0, y=index * self.ROW_HEIGHT, relwidth=1)
+                card.row = index
+        return changes
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Travel & Visa Consultant")
+    parser.add_argument("--kb", default="travel_kb.pl",
+                        help="Prolog knowledge base to load")
+    parser.add_argument("--lazy", action="store_true",
+                        help="show the window first and load the knowledge base in the background")
+    parser.add_argument("--materialize", action="store_true",
+                        help="precompute every recommendation when the knowledge base loads")
+    parser.add_argument("--no-snapshot", dest="snapshot", action="store_false",
+                        help="always consult the .pl source instead of a compiled snapshot")
+    parser.add_argument("--watch", action="store_true",
+                        help="reload the knowledge base whenever the file changes")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="record query and render metrics and serve them on this port")
+    parser.add_argument("--backend", choices=TravelExpertSystem.BACKENDS, default="prolog",
+                        help="evaluate the recommendation rules in Prolog (default) or natively "
+                             "in Python, falling back to Prolog if the rules were changed")
+    parser.add_argument("--result-cache", nargs="?", const=True, metavar="FILE",
+                        help="keep recommendation results in a SQLite cache that survives restarts "
+                             "(default file: .kb_cache/<kb>-results.sqlite)")
+    parser.add_argument("--result-cache-mb", type=float, default=64, metavar="MB",
+                        help="size limit of the result cache")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="run the headless HTTP/JSON server instead of the GUI")
+    parser.add_argument("--batch", metavar="INPUT",
+                        help="score the profiles in a CSV or JSONL file ('-' for stdin) and exit")
+    parser.add_argument("--output", default="-", metavar="FILE",
+                        help="with --batch, where to write the JSONL results (default stdout)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"),
+                        help="with --batch, input format (default from the file extension)")
+    parser.add_argument("--chunk-size", type=int, default=5000, metavar="N",
+                        help="with --batch, profiles scored per call")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="with --serve or --batch, spread queries over N engine processes")
+    args = parser.parse_args()
+    
+    metrics = None
+    if args.metrics_port is not None:
+        metrics = Metrics()
+        metrics.serve(args.metrics_port)
+    
+    if args.batch:
+        engine_options = dict(materialize=args.materialize, snapshot=args.snapshot,
+                              backend=args.backend, result_cache=args.result_cache,
+                              result_cache_mb=args.result_cache_mb)
+        # Status lines go to stderr so the results can be piped from stdout
+        sys.stdout = sys.stderr
+        if args.workers:
+            engine = EnginePool(args.kb, workers=args.workers, **engine_options)
+        else:
+            engine = TravelExpertSystem(args.kb, **engine_options)
+        out = sys.__stdout__ if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            stats = score_profiles(engine, read_profiles(args.batch, args.input_format), out,
+                                   args.chunk_size, parallel=args.workers or 1)
+        finally:
+            if out is not sys.__stdout__:
+                out.close()
+            if args.workers:
+                engine.close()
+        print(f"✓ Scored {stats['profiles']:,} profiles ({stats['errors']:,} invalid) in "
+              f"{stats['chunks']:,} chunks, {stats['seconds']:.1f} s, "
+              f"{stats['profiles_per_second']:,.0f} profiles/s")
+        sys.exit(0)
+    
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        engine_options = dict(materialize=args.materialize, snapshot=args.snapshot,
+                              watch=args.watch, backend=args.backend,
+                              result_cache=args.result_cache,
+                              result_cache_mb=args.result_cache_mb)
+        if args.workers:
+            factory = lambda: EnginePool(args.kb, workers=args.workers, metrics=metrics,
+                                         **engine_options)
+        else:
+            factory = lambda: TravelExpertSystem(args.kb, metrics=metrics, **engine_options)
+        RecommendationServer(factory, host or "127.0.0.1", int(port),
+                             threads=max(1, 2 * (args.workers or 0)), metrics=metrics).run()
+        sys.exit(0)
+    
     try:
-        app = TravelGUI()
+        app = TravelGUI(kb_file=args.kb, lazy=args.lazy, materialize=args.materialize,
+                        snapshot=args.snapshot, watch=args.watch, metrics=metrics,
+                        backend=args.backend, result_cache=args.result_cache,
+                        result_cache_mb=args.result_cache_mb)
         app.run()
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,108 @@
+"""
+Bulk scoring: read_profiles, _score_chunk and score_profiles with a stand-in engine.
+
+Usage: python -m pytest tests
+"""
+
+import io
+import json
+
+from main import Destination, read_profiles, score_profiles, _score_chunk
+
+
+class Engine:
+    """get_recommendations_many and rank_by_amount answered from dicts"""
+
+    def __init__(self, levels=None, amounts=None, error=None):
+        self.levels = levels or {}
+        self.amounts = amounts or {}
+        self.error = error
+        self.calls = []
+
+    def get_recommendations_many(self, profiles):
+        self.calls.append(('many', list(profiles)))
+        if self.error is not None:
+            raise self.error
+        return [self.levels.get(profile, []) for profile in profiles]
+
+    def rank_by_amount(self, amount, interest):
+        self.calls.append(('amount', amount, interest))
+        return self.amounts.get((amount, interest), [])
+
+
+def dest(name):
+    return Destination(name, 'visa_free', 'Passport', 'November to April', 2000)
+
+
+def test_read_profiles_jsonl_yields_bad_lines_as_errors(tmp_path):
+    path = tmp_path / "profiles.jsonl"
+    path.write_text('{"budget": "high", "interest": "beach"}\n\n{"budget": \n'
+                    '{"amount": 1500, "interest": "city", "id": 7}\n', encoding='utf-8')
+    profiles = list(read_profiles(str(path)))
+    assert profiles[0] == {'budget': 'high', 'interest': 'beach'}
+    assert isinstance(profiles[1], ValueError)
+    assert profiles[2] == {'amount': 1500, 'interest': 'city', 'id': 7}
+    assert len(profiles) == 3
+
+
+def test_read_profiles_csv(tmp_path):
+    path = tmp_path / "profiles.txt"
+    path.write_text("id,budget,interest,amount\r\na,low,nature,\r\nb,,city,2600\r\n",
+                    encoding='utf-8')
+    profiles = list(read_profiles(str(path), fmt='csv'))
+    assert profiles == [
+        {'id': 'a', 'budget': 'low', 'interest': 'nature', 'amount': ''},
+        {'id': 'b', 'budget': '', 'interest': 'city', 'amount': '2600'},
+    ]
+
+
+def test_score_chunk_answers_levels_and_amounts():
+    engine = Engine(levels={('high', 'beach'): [dest('maldives'), dest('turkey')]},
+                    amounts={(2600.0, 'city'): [dict(dest('uk'), score=0.12345)]})
+    chunk = [(1, {'budget': 'high', 'interest': 'beach', 'id': 'x'}),
+             (2, {'budget': 'high', 'interest': 'beach'}),
+             (3, {'amount': '2600', 'interest': 'city', 'budget': ''})]
+    records = _score_chunk(engine, chunk)
+    assert records == [
+        {'line': 1, 'id': 'x', 'interest': 'beach', 'budget': 'high',
+         'destinations': ['maldives', 'turkey']},
+        {'line': 2, 'interest': 'beach', 'budget': 'high', 'destinations': ['maldives', 'turkey']},
+        {'line': 3, 'interest': 'city', 'amount': 2600.0, 'destinations': ['uk'], 'scores': [0.1235]},
+    ]
+    # All level profiles of a chunk go in one call, which removes duplicates itself
+    assert engine.calls == [('many', [('high', 'beach'), ('high', 'beach')]),
+                            ('amount', 2600.0, 'city')]
+
+
+def test_score_chunk_reports_invalid_rows():
+    chunk = [(1, ValueError("Expecting value")),
+             (2, {'budget': 'high'}),
+             (3, {'budget': '', 'interest': 'beach'}),
+             (4, {'amount': 'nan', 'interest': 'beach'}),
+             (5, {'amount': 'lots', 'interest': 'beach'}),
+             (6, ['high', 'beach'])]
+    records = _score_chunk(Engine(), chunk)
+    assert [record['line'] for record in records] == [1, 2, 3, 4, 5, 6]
+    assert all(set(record) == {'line', 'error'} for record in records)
+    assert all(record['error'].startswith("invalid profile: ") for record in records)
+    assert "finite" in records[3]['error']
+
+
+def test_score_chunk_marks_failed_queries():
+    engine = Engine(error=RuntimeError("Stack limit exceeded"))
+    records = _score_chunk(engine, [(1, {'budget': 'high', 'interest': 'beach'})])
+    assert records == [{'line': 1, 'error': "query failed: RuntimeError('Stack limit exceeded')"}]
+
+
+def test_score_profiles_keeps_input_order_across_chunks():
+    engine = Engine(levels={('low', 'nature'): [dest('nepal')]})
+    profiles = [{'budget': 'low', 'interest': 'nature', 'id': i} for i in range(7)]
+    profiles.insert(3, {'interest': 'nature'})
+    out = io.StringIO()
+    stats = score_profiles(engine, profiles, out, chunk_size=2, parallel=2)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record['line'] for record in records] == list(range(1, 9))
+    assert records[3] == {'line': 4, 'error': records[3]['error']}
+    assert records[0]['destinations'] == ['nepal']
+    assert (stats['profiles'], stats['errors'], stats['chunks']) == (8, 1, 4)
@@ -0,0 +1,62 @@
+"""
+Destination, the shared read-only record that replaced per-solution dicts.
+
+Usage: python -m pytest tests
+"""
+
+import json
+import pickle
+import threading
+
+import pytest
+
+from main import Destination, TravelExpertSystem, json_default
+
+
+FIELDS = dict(destination='nepal', visa_status='visa_on_arrival',
+              documents='Valid passport, 2 passport photos',
+              best_season='September to November', min_budget=500)
+
+
+def test_reads_like_the_dict_it_replaces():
+    dest = Destination(**FIELDS)
+    assert dest['visa_status'] == 'visa_on_arrival'
+    assert dest.get('min_budget') == 500
+    assert dest.get('rating') is None
+    assert list(dest) == list(FIELDS)
+    assert len(dest) == 5
+    assert dict(dest) == dest.to_dict() == FIELDS
+    assert dest == FIELDS and FIELDS == dest
+    assert dest != dict(FIELDS, min_budget=650)
+    with pytest.raises(KeyError):
+        dest['rating']
+
+
+def test_is_read_only_and_unhashable():
+    dest = Destination(**FIELDS)
+    with pytest.raises(AttributeError):
+        dest.min_budget = 650
+    with pytest.raises(AttributeError):
+        dest.rating = 5
+    with pytest.raises(TypeError):
+        hash(dest)
+
+
+def test_pickles_and_serializes_to_json():
+    dest = Destination(**FIELDS)
+    copy = pickle.loads(pickle.dumps(dest))
+    assert copy == dest and copy is not dest
+    assert json.loads(json.dumps([dest], default=json_default)) == [FIELDS]
+    with pytest.raises(TypeError):
+        json.dumps(object(), default=json_default)
+
+
+def test_engine_shares_one_record_per_destination():
+    engine = TravelExpertSystem.__new__(TravelExpertSystem)
+    engine._lock, engine._records = threading.RLock(), {}
+    first = engine._record(*FIELDS.values())
+    assert engine._record(*FIELDS.values()) is first
+    # Changed facts give a new record; the old one is left as it was
+    edited = engine._record(*dict(FIELDS, min_budget=650).values())
+    assert edited is not first and first['min_budget'] == 500
+    assert engine._record(*dict(FIELDS, min_budget=650).values()) is edited
@@ -0,0 +1,137 @@
+"""
+KB source parsing used by hot reload: _FACT_RE, _fact_value and _split_facts.
+
+Usage: python -m pytest tests
+"""
+
+import threading
+
+from main import TravelExpertSystem, _FACT_RE, _fact_value, _split_facts
+
+KB = """\
+% FACTS
+visa_status(maldives, visa_free).
+visa_status('cote_d''ivoire', visa_required).   % doubled quote
+visa_documents(nepal, 'Valid passport, 2 photos').
+visa_documents(turkey, 'Traveller\\'s e-visa').
+min_budget(nepal, 500).   % USD
+
+can_visit(Dest, Budget, Interest) :-
+    interest_match(Dest, Interest),
+    budget_level(Dest, Level),
+    budget_matches(Budget, Level).
+"""
+
+
+def test_fact_re_matches_only_whole_fact_lines():
+    matches = [m.group(1, 2, 3) for m in _FACT_RE.finditer(KB)]
+    assert matches == [
+        ('visa_status', 'maldives', 'visa_free'),
+        ('visa_status', "'cote_d''ivoire'", 'visa_required'),
+        ('visa_documents', 'nepal', "'Valid passport, 2 photos'"),
+        ('visa_documents', 'turkey', "'Traveller\\'s e-visa'"),
+        ('min_budget', 'nepal', '500'),
+    ]
+    assert not _FACT_RE.search("    interest_match(Dest, Interest),")
+    assert not _FACT_RE.search("visa_status(uk, visa_required), extra.")
+
+
+def test_fact_value_unquotes_atoms_and_reads_integers():
+    assert _fact_value("'cote_d''ivoire'") == "cote_d'ivoire"
+    assert _fact_value("'Traveller\\'s e-visa'") == "Traveller's e-visa"
+    assert _fact_value("'Passport\\\\copy'") == "Passport\\copy"
+    assert _fact_value("maldives") == "maldives"
+    assert _fact_value("500") == 500
+    assert _fact_value("-20") == -20
+
+
+def test_split_facts_separates_facts_from_rules():
+    facts, rest = _split_facts(KB)
+    assert list(facts) == [
+        ('visa_status', 'maldives', 'visa_free'),
+        ('visa_status', "cote_d'ivoire", 'visa_required'),
+        ('visa_documents', 'nepal', 'Valid passport, 2 photos'),
+        ('visa_documents', 'turkey', "Traveller's e-visa"),
+        ('min_budget', 'nepal', 500),
+    ]
+    # Comments and blank lines are dropped; rule lines are kept as written
+    assert rest == [
+        "can_visit(Dest, Budget, Interest) :-",
+        "    interest_match(Dest, Interest),",
+        "    budget_level(Dest, Level),",
+        "    budget_matches(Budget, Level).",
+    ]
+
+
+def test_split_facts_ignores_crlf_and_comment_changes():
+    facts, rest = _split_facts(KB)
+    edited = KB.replace("% USD", "% US dollars").replace("\n", "\r\n")
+    assert _split_facts(edited) == (facts, rest)
+
+
+def test_split_facts_gives_up_on_what_the_lines_cannot_show():
+    # A block comment may hide fact lines, \n is not decoded and duplicate
+    # clauses cannot be retracted one at a time
+    for text in (KB + "/*\nmin_budget(uk, 2500).\n*/\n",
+                 KB + "visa_documents(uk, 'Passport\\nPhotos').\n",
+                 KB + "min_budget(nepal, 500).\n"):
+        assert _split_facts(text)[0] is None
+
+
+class ApplyQuery:
+    """Records the kb_apply_changes/2 calls reload() makes"""
+
+    def __init__(self):
+        self.calls = []
+
+    def solutions(self, retract, assert_):
+        self.calls.append((retract, assert_))
+        return iter(())
+
+
+def make_engine(kb_file, text):
+    kb_file.write_text(text, encoding='utf-8')
+    engine = TravelExpertSystem.__new__(TravelExpertSystem)
+    engine.kb_file = str(kb_file)
+    engine.kb_hash, engine._kb_text, engine._kb_parts = "0" * 16, text, None
+    engine.kb_version, engine._records, engine.result_cache = 1, {}, None
+    engine._lock = threading.RLock()
+    engine._apply_query = ApplyQuery()
+    engine.reconsults = 0
+
+    def reconsult():
+        engine.reconsults += 1
+    engine._load_knowledge_base = reconsult
+    return engine
+
+
+def test_fact_edit_is_one_remove_and_one_add(tmp_path):
+    kb_file = tmp_path / "travel_kb.pl"
+    engine = make_engine(kb_file, KB)
+
+    kb_file.write_text(KB.replace("min_budget(nepal, 500).", "min_budget(nepal, 650)."),
+                       encoding='utf-8')
+    summary = engine.reload()
+
+    assert summary['mode'] == 'incremental'
+    assert (summary['added'], summary['removed']) == (1, 1)
+    assert engine._apply_query.calls == [
+        ([['min_budget', 'nepal', 500]], [['min_budget', 'nepal', 650]]),
+    ]
+    assert engine.kb_version == 2
+
+
+def test_untrusted_fact_edits_reconsult(tmp_path):
+    kb_file = tmp_path / "travel_kb.pl"
+    duplicated = KB + "min_budget(nepal, 500).\n"
+    commented = KB + "/* min_budget(uk, 2500). */\n"
+    escaped = KB + "visa_documents(uk, 'Passport\\nPhotos').\n"
+    # Removing one of two identical clauses, editing facts beside a block
+    # comment, and adding a fact with an escape
+    for old, new in ((duplicated, KB), (commented, commented.replace("500", "650")),
+                     (KB, escaped)):
+        engine = make_engine(kb_file, old)
+        kb_file.write_text(new, encoding='utf-8')
+        assert engine.reload()['mode'] == 'reconsult'
+        assert engine.reconsults == 1
+        assert engine._apply_query.calls == []
@@ -0,0 +1,36 @@
+"""
+InterestIndex, the bitmask index behind multi-interest search.
+
+Usage: python -m pytest tests
+"""
+
+from main import Destination, InterestIndex
+
+
+ROWS = [
+    Destination('maldives', 'visa_free', 'Valid passport, Return ticket, Hotel booking',
+                'November to April (Dry season)', 2000),
+    Destination('nepal', 'visa_on_arrival', 'Valid passport, 2 passport photos',
+                'September to November', 500),
+    Destination('turkey', 'e_visa', 'Passport, Hotel bookings, Bank statement',
+                'April-May, September-October', 1000),
+    Destination('uk', 'visa_required', 'Passport, Bank statements, Return tickets',
+                'Year-round', 2500),
+]
+
+
+def test_interest_index_any_all_and_budget():
+    interests = [('maldives', 'beach'), ('turkey', 'beach'), ('turkey', 'history'),
+                 ('nepal', 'nature'), ('uk', 'city'), ('uk', 'history')]
+    levels = [('maldives', 'high'), ('nepal', 'low'), ('turkey', 'medium'), ('uk', 'high')]
+    budget_matches = [('high', 'high'), ('high', 'medium'), ('medium', 'medium'),
+                      ('medium', 'low'), ('low', 'low')]
+    index = InterestIndex(ROWS, interests, levels, budget_matches, version=1, build_seconds=0.0)
+    names = lambda rows: [row['destination'] for row in rows]
+
+    assert names(index.lookup('high', ['beach', 'city'])) == ['maldives', 'turkey', 'uk']
+    assert names(index.lookup('high', ['beach', 'history'], match='all')) == ['turkey']
+    assert names(index.lookup('medium', ['beach', 'nature'])) == ['nepal', 'turkey']
+    assert index.lookup('low', ['city']) == []
+    assert index.lookup('unknown', ['beach']) == []
+    assert index.lookup('high', []) == []
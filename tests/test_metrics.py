@@ -0,0 +1,64 @@
+"""
+Histogram and Metrics, the opt-in query and render instrumentation.
+
+Usage: python -m pytest tests
+"""
+
+import json
+import urllib.request
+
+from main import Histogram, Metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5, 10), window=3)
+    for value in (0.5, 1, 3, 7, 50):
+        histogram.observe(value)
+    data = histogram.to_dict()
+    # A value equal to a bound falls in that bound's bucket
+    assert data['buckets'] == {'1': 2, '5': 3, '10': 4, '+Inf': 5}
+    assert (data['count'], data['sum']) == (5, 61.5)
+    # Percentiles only cover the last `window` observations
+    assert data['recent'] == {'window': 3, 'p50': 7, 'p90': 50, 'p99': 50, 'max': 50}
+
+
+def test_empty_histogram_reports_zeros():
+    data = Histogram((1, 5)).to_dict()
+    assert data['buckets'] == {'1': 0, '5': 0, '+Inf': 0}
+    assert data['recent'] == {'window': 0, 'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+
+
+def test_prometheus_text():
+    metrics = Metrics(prefix="test_")
+    metrics.observe('render_ms', 3)
+    metrics.observe('render_ms', 300)
+    lines = metrics.to_prometheus().splitlines()
+
+    assert "# HELP test_render_ms Result card reconciliation time in milliseconds" in lines
+    assert "# TYPE test_render_ms histogram" in lines
+    assert 'test_render_ms_bucket{le="2.5"} 0' in lines
+    assert 'test_render_ms_bucket{le="5"} 1' in lines
+    assert 'test_render_ms_bucket{le="+Inf"} 2' in lines
+    assert "test_render_ms_sum 303.0" in lines
+    assert "test_render_ms_count 2" in lines
+    assert "# TYPE test_render_ms_recent gauge" in lines
+    assert 'test_render_ms_recent{quantile="0.50"} 300' in lines
+    assert 'test_render_ms_recent{quantile="0.99"} 300' in lines
+    # Every metric is exported, observed or not
+    assert "test_http_request_ms_count 0" in lines
+    assert sum(line.startswith("# TYPE") for line in lines) == 2 * len(Metrics.DEFINITIONS)
+
+
+def test_serve_exports_both_formats():
+    metrics = Metrics()
+    metrics.observe('search_wall_ms', 12)
+    server = metrics.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics") as response:
+            assert "travel_search_wall_ms_count 1" in response.read().decode('utf-8')
+        with urllib.request.urlopen(url + "/metrics.json") as response:
+            assert json.load(response)['search_wall_ms']['count'] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
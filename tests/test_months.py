@@ -0,0 +1,77 @@
+"""
+Travel-month filtering: season_mask, month_bits and the month masks of
+InterestIndex and DestinationColumns.
+
+Usage: python -m pytest tests
+"""
+
+import datetime
+
+import pytest
+
+from main import ALL_MONTHS, Destination, InterestIndex, month_bits, season_mask
+
+
+def months(*numbers):
+    """Mask of 1-based month numbers"""
+    return sum(1 << (n - 1) for n in numbers)
+
+
+ROWS = [
+    Destination('maldives', 'visa_free', 'Passport', 'November to April (Dry season)', 2000),
+    Destination('nepal', 'visa_on_arrival', 'Passport', 'September to November', 500),
+    Destination('turkey', 'e_visa', 'Passport', 'April-May, September-October', 1000),
+    Destination('uk', 'visa_required', 'Passport', 'Year-round', 2500),
+    Destination('kerala', 'e_visa', 'Passport', 'Monsoon', 800),
+]
+
+
+def test_season_mask_wraps_past_december():
+    assert season_mask('November to April (Dry season)') == months(11, 12, 1, 2, 3, 4)
+    assert season_mask('Dec - Feb') == months(12, 1, 2)
+    assert season_mask('September to November') == months(9, 10, 11)
+
+
+def test_season_mask_combines_ranges_and_single_months():
+    assert season_mask('April-May, September-October') == months(4, 5, 9, 10)
+    assert season_mask('March and Sept') == months(3, 9)
+    assert season_mask('June, July (Summer)') == months(6, 7)
+    assert season_mask('Best from November to April') == months(11, 12, 1, 2, 3, 4)
+    assert season_mask('Year-round') == ALL_MONTHS
+
+
+def test_season_mask_ignores_month_words_inside_phrases():
+    assert season_mask('may be hot') == 0
+    assert season_mask('Crowds march in from June to August') == months(6, 7, 8)
+    assert season_mask('Spring and autumn') == 0
+    assert season_mask('When it is sunny') == 0
+
+
+def test_month_bits():
+    assert month_bits(12) == months(12)
+    assert month_bits('May') == months(5)
+    assert month_bits('December to February') == months(12, 1, 2)
+    assert month_bits(datetime.date(2026, 3, 14)) == months(3)
+    assert month_bits((datetime.date(2026, 11, 20), datetime.date(2027, 1, 5))) == months(11, 12, 1)
+    assert month_bits((datetime.date(2026, 1, 1), datetime.date(2027, 1, 1))) == ALL_MONTHS
+    with pytest.raises(ValueError):
+        month_bits(13)
+    with pytest.raises(ValueError):
+        month_bits('Smarch')
+
+
+def test_in_season_keeps_order_and_unknown_seasons():
+    index = InterestIndex(ROWS, [], [], [], version=1, build_seconds=0.0)
+    names = lambda rows: [row['destination'] for row in rows]
+    assert index.unknown_seasons == ['kerala']
+    assert names(index.in_season(ROWS, months(1))) == ['maldives', 'uk', 'kerala']
+    assert names(index.in_season(ROWS[::-1], months(10))) == ['kerala', 'uk', 'turkey', 'nepal']
+    assert names(index.rows_for(index.months_mask(months(4)))) == ['maldives', 'turkey', 'uk', 'kerala']
+
+
+def test_ranking_columns_keep_unknown_seasons():
+    pytest.importorskip("numpy")
+    from main import DestinationColumns
+    columns = DestinationColumns(ROWS, ['easy'] * len(ROWS), [], version=1, build_seconds=0.0)
+    ranked = columns.top_k(3000, months=months(7))
+    assert sorted(row['destination'] for row in ranked) == ['kerala', 'uk']
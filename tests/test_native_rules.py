@@ -0,0 +1,65 @@
+"""
+NativeRules, the Python evaluation of the KB's rules, on travel_kb.pl's own facts.
+
+Usage: python -m pytest tests
+"""
+
+import os
+import re
+
+import pytest
+
+from main import Destination, NativeRules, _split_facts
+
+
+KB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "travel_kb.pl")
+
+
+@pytest.fixture(scope="module")
+def kb():
+    with open(KB_FILE, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def rules(kb):
+    facts = {name: [] for name in NativeRules.FACTS}
+    for name, a, b in _split_facts(kb)[0]:
+        facts[name].append((a, b))
+    facts['budget_matches'] = re.findall(r"^budget_matches\((\w+), (\w+)\)\.", kb, re.M)
+    return NativeRules(facts, Destination, version=1)
+
+
+def test_supports_travel_kb_rules(kb):
+    rest = _split_facts(kb)[1]
+    assert NativeRules.supports(rest)
+    # Layout does not matter
+    assert NativeRules.supports([" ".join(line.split()) for line in rest])
+
+
+def test_edited_or_extra_rules_are_not_supported(kb):
+    rest = _split_facts(kb)[1]
+    edited = [line.replace("UserBudgetAmount >= MinRequired", "UserBudgetAmount > MinRequired")
+              for line in rest]
+    assert not NativeRules.supports(edited)
+    assert not NativeRules.supports(rest + ["can_visit(Dest, _, any) :- budget_level(Dest, _)."])
+    assert not NativeRules.supports([line for line in rest if "visa_on_arrival" not in line])
+
+
+def test_answers_match_the_readme_examples(rules):
+    names = lambda records: [record['destination'] for record in records]
+    assert names(rules.destination_info('low', 'nature')) == ['nepal']
+    assert names(rules.destination_info('high', 'beach')) == ['maldives', 'turkey']
+    assert names(rules.destination_info('medium', 'history')) == ['turkey']
+    assert names(rules.destination_info('low', 'city')) == []
+    assert list(rules.can_visit('high', 'city')) == ['uk', 'dubai']
+
+
+def test_visa_rules(rules):
+    assert rules.visa_difficulty('nepal') == ['easy']
+    assert rules.visa_difficulty('atlantis') == []
+    assert rules.in_budget_range('turkey', 1000)
+    assert not rules.in_budget_range('turkey', 999.5)
+    status, difficulty, docs = next(rules.visa_info('turkey'))
+    assert (status, difficulty) == ('e_visa', 'moderate')
+    assert docs.startswith("E-visa")
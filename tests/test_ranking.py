@@ -0,0 +1,58 @@
+"""
+Exact-amount ranking over DestinationColumns.
+
+Usage: python -m pytest tests
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from main import Destination, DestinationColumns, TravelExpertSystem
+
+ROWS = [
+    Destination('maldives', 'visa_free', 'Passport', 'November to April', 2000),
+    Destination('nepal', 'visa_on_arrival', 'Passport, photos', 'September to November', 500),
+    Destination('turkey', 'e_visa', 'Passport, e-visa', 'April to May', 1000),
+    Destination('uk', 'visa_required', 'Passport, bank statements', 'Year-round', 2500),
+]
+DIFFICULTIES = ['easy', 'moderate', 'easy', 'difficult']
+INTERESTS = [('maldives', 'beach'), ('turkey', 'beach'), ('turkey', 'history'),
+             ('nepal', 'nature'), ('uk', 'city')]
+
+
+@pytest.fixture
+def columns():
+    return DestinationColumns(ROWS, DIFFICULTIES, INTERESTS, version=1, build_seconds=0.0)
+
+
+def test_top_k_ranks_affordable_destinations(columns):
+    ranked = columns.top_k(2000, 'beach', k=10)
+    assert [row['destination'] for row in ranked] == ['turkey', 'maldives', 'nepal']
+    assert ranked[0]['score'] == pytest.approx(0.25 * 0.5 + 0.25 * 1.0 + 0.5)
+    assert [row['destination'] for row in columns.top_k(2000, 'beach', k=1)] == ['turkey']
+    assert columns.top_k(400, 'beach') == []
+
+
+def test_top_k_scores_the_share_of_interests_matched(columns):
+    ranked = columns.top_k(3000, ['beach', 'history'], k=10)
+    assert ranked[0]['destination'] == 'turkey'
+    scores = {row['destination']: row['score'] for row in ranked}
+    assert scores['turkey'] - scores['maldives'] == pytest.approx(0.5 * 0.5 + 0.25 * 1000 / 3000)
+
+
+def test_top_k_month_filter(columns):
+    ranked = columns.top_k(3000, 'beach', months=1 << 0)   # January
+    assert [row['destination'] for row in ranked] == ['maldives', 'uk']
+
+
+@pytest.mark.parametrize('amount', [0, -100, float('nan'), float('inf'), float('-inf')])
+def test_top_k_rejects_amounts_that_are_not_positive_and_finite(columns, amount):
+    assert columns.top_k(amount, 'beach') == []
+
+
+@pytest.mark.parametrize('amount', [float('nan'), float('inf')])
+def test_rank_by_amount_raises_for_non_finite_amounts(amount):
+    engine = TravelExpertSystem.__new__(TravelExpertSystem)
+    with pytest.raises(ValueError):
+        engine.rank_by_amount(amount, 'beach')
@@ -0,0 +1,53 @@
+"""
+get_recommendations_many with a stand-in for destination_info_batch/3.
+
+Usage: python -m pytest tests
+"""
+
+import threading
+
+import pytest
+
+from main import TravelExpertSystem
+
+
+class BatchQuery:
+    """Answers destination_info_batch/3 from a dict, or raises `error`"""
+
+    def __init__(self, answers, error=None):
+        self.answers = answers
+        self.error = error
+        self.calls = []
+
+    def solutions(self, budgets, interests):
+        self.calls.append((budgets, interests))
+        if self.error is not None:
+            raise self.error
+        yield ([self.answers.get(key, []) for key in zip(budgets, interests)],)
+
+
+def batch_engine(query):
+    engine = TravelExpertSystem.__new__(TravelExpertSystem)
+    engine.materialize, engine.backend = False, 'prolog'
+    engine._lock = threading.RLock()
+    engine._records = {}
+    engine._batch_query = query
+    return engine
+
+
+def test_distinct_profiles_go_to_prolog_once():
+    row = ('maldives', 'visa_free', 'Passport', 'November to April', 2000)
+    query = BatchQuery({('high', 'beach'): [row]})
+    engine = batch_engine(query)
+
+    results = engine.get_recommendations_many([('high', 'beach'), ('low', 'city'), ('high', 'beach')])
+
+    assert query.calls == [(['high', 'low'], ['beach', 'city'])]
+    assert [[dest['destination'] for dest in result] for result in results] == [['maldives'], [], ['maldives']]
+    assert results[0][0] is results[2][0]
+
+
+def test_prolog_error_is_raised_not_answered_empty():
+    engine = batch_engine(BatchQuery({}, error=RuntimeError("Stack limit exceeded")))
+    with pytest.raises(RuntimeError):
+        engine.get_recommendations_many([('high', 'beach')])
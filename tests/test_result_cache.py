@@ -0,0 +1,120 @@
+"""
+ResultCache behaviour that does not need SWI-Prolog.
+
+Usage: python -m pytest tests
+"""
+
+import os
+import threading
+
+from main import Destination, ResultCache, TravelExpertSystem
+
+
+class FakeProlog:
+    """Stands in for pyswip.Prolog: qcompile/1 writes <file>.qlf next to the file"""
+
+    def __init__(self):
+        self.consulted = []
+
+    def consult(self, path):
+        self.consulted.append(path)
+
+    def query(self, goal):
+        if goal.startswith("qcompile('"):
+            source = goal[len("qcompile('"):-len("')")]
+            with open(os.path.splitext(source)[0] + ".qlf", "w") as f:
+                f.write("compiled")
+        return iter(())
+
+
+class FailingQuery:
+    """A destination_info/7 query that raises after its first solution"""
+
+    def solutions(self, *values):
+        yield ('paris', 'visa_free', 'Passport', 'April to June', 800)
+        raise RuntimeError("Stack limit exceeded")
+
+
+def snapshot_engine(kb_file):
+    """A TravelExpertSystem with only what _consult_kb() needs"""
+    engine = TravelExpertSystem.__new__(TravelExpertSystem)
+    engine.kb_file = kb_file
+    engine.snapshot_dir = os.path.join(os.path.dirname(kb_file), ".kb_cache")
+    engine.prolog = FakeProlog()
+    engine._loaded_source = None
+    return engine
+
+
+def test_snapshot_compile_keeps_result_cache(tmp_path):
+    kb_file = tmp_path / "travel_kb.pl"
+    kb_file.write_text("destination(paris, france).\n")
+    cache_dir = tmp_path / ".kb_cache"
+    cache_path = cache_dir / "travel_kb-results.sqlite"
+    cache = ResultCache(str(cache_path))
+    cache.put("0123456789abcdef", "q", [])
+    stale = cache_dir / "travel_kb-0123456789abcdef.qlf"
+    stale.write_text("old snapshot")
+
+    engine = snapshot_engine(str(kb_file))
+    engine._consult_kb()
+
+    assert engine.loaded_from == "source"
+    assert os.path.exists(engine._loaded_source[:-3] + ".qlf")
+    assert not stale.exists()
+    assert cache_path.exists()
+    assert cache.stats()['entries'] == 1
+    cache.close()
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite"), max_mb=16 / 1024)
+    kb_hash = "0123456789abcdef"
+    # Random text barely compresses, so each entry takes over 1 KiB
+    results = lambda i: [Destination(f"dest{i}", 'e_visa', os.urandom(1024).hex(), 'May', i)]
+    for i in range(8):
+        cache.put(kb_hash, ['high', f'interest{i}'], results(i))
+    # A disk read marks entry 0 as recently used; the in-process copy would not
+    cache._memory.clear()
+    assert cache.get(kb_hash, ['high', 'interest0'], Destination) is not None
+    for i in range(8, 17):
+        cache.put(kb_hash, ['high', f'interest{i}'], results(i))
+
+    stats = cache.stats()
+    assert stats['bytes'] <= stats['max_bytes']
+    stored = {query for (query,) in cache._db.execute("SELECT query FROM results")}
+    assert '["high", "interest0"]' in stored
+    assert '["high", "interest1"]' not in stored
+    assert '["high", "interest16"]' in stored
+    assert {query for _, query in cache._memory} <= stored
+    cache.close()
+
+
+def test_invalidate_keeps_other_hashes_in_use(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    old, new = "0123456789abcdef", "fedcba9876543210"
+    cache.put(old, ['high', 'beach'], [])
+    cache.put(old, ['low', 'nature'], [])
+    cache._db.execute("UPDATE results SET used = used - ? WHERE query = ?",
+                      (ResultCache.STALE_SECONDS + 60, '["low", "nature"]'))
+    cache.put(new, ['high', 'beach'], [])
+
+    cache.invalidate(new)
+
+    stored = set(cache._db.execute("SELECT kb_hash, query FROM results"))
+    assert stored == {(old, '["high", "beach"]'), (new, '["high", "beach"]')}
+    cache.close()
+
+
+def test_failed_query_is_not_cached(tmp_path):
+    engine = TravelExpertSystem.__new__(TravelExpertSystem)
+    engine.result_cache = cache = ResultCache(str(tmp_path / "results.sqlite"))
+    engine.kb_hash, engine.kb_version = "0123456789abcdef", 1
+    engine.metrics, engine.materialize, engine.backend = None, False, 'prolog'
+    engine._lock = threading.RLock()
+    engine._records = {}
+    engine._destination_query = FailingQuery()
+
+    assert [dest['destination'] for dest in engine.get_recommendations('high', 'beach')] == ['paris']
+    assert cache.get(engine.kb_hash, ['high', 'beach', None], engine._record) is None
+    assert cache.stats()['entries'] == 0
+    cache.close()
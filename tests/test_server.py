@@ -0,0 +1,100 @@
+"""
+RecommendationServer request handling with a stand-in engine, no sockets.
+
+Usage: python -m pytest tests
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from main import Destination, RecommendationServer
+
+
+NEPAL = Destination('nepal', 'visa_on_arrival', 'Valid passport', 'September to November', 500)
+
+
+class Engine:
+    """Records the engine calls a request makes"""
+
+    def __init__(self):
+        self.kb_version = 1
+        self.calls = []
+
+    def get_recommendations(self, budget, interest, months=None):
+        self.calls.append(('one', budget, interest, months))
+        return [NEPAL]
+
+    def get_recommendations_multi(self, budget, interests, match, months=None):
+        self.calls.append(('multi', budget, interests, match, months))
+        return [NEPAL]
+
+    def rank_by_amount(self, amount, interests, k, budget, months):
+        self.calls.append(('amount', amount, interests, k, months))
+        return []
+
+    def visa_info(self, destination):
+        self.calls.append(('visa', destination))
+        if destination == 'nepal':
+            return {'status': 'visa_on_arrival', 'difficulty': 'easy', 'documents': 'Valid passport'}
+        return None
+
+
+@pytest.fixture
+def server():
+    server = RecommendationServer(None)
+    server.engine = Engine()
+    yield server
+    server._executor.shutdown()
+
+
+def get(server, target):
+    status, body = asyncio.run(server._respond("GET", target))
+    return status, json.loads(body)
+
+
+def test_queries_are_parsed_into_engine_calls(server):
+    assert get(server, "/recommendations?budget=low&interest=nature") == (
+        200, {'count': 1, 'results': [NEPAL.to_dict()]})
+    get(server, "/recommendations?budget=low&interest=nature&interest=city&match=all&month=9")
+    get(server, "/recommendations?amount=1500&interest=beach&k=3&month=December")
+    assert server.engine.calls == [
+        ('one', 'low', 'nature', None),
+        ('multi', 'low', ['city', 'nature'], 'all', [9]),
+        ('amount', 1500.0, ['beach'], 3, ['December']),
+    ]
+
+
+@pytest.mark.parametrize("query", [
+    "budget=low",
+    "budget=low&interest=nature&match=some",
+    "interest=nature",
+    "amount=nan&interest=beach",
+    "amount=inf&interest=beach",
+    "amount=lots&interest=beach",
+    "amount=1500&interest=beach&k=ten",
+    "budget=low&interest=nature&month=13",
+])
+def test_bad_queries_are_400(server, query):
+    status, body = get(server, "/recommendations?" + query)
+    assert status == 400 and body['error']
+    assert server.engine.calls == []
+
+
+def test_visa_and_unknown_paths(server):
+    assert get(server, "/visa/nepal")[0] == 200
+    assert get(server, "/visa/atlantis")[0] == 404
+    assert get(server, "/flights")[0] == 404
+    assert asyncio.run(server._respond("POST", "/visa/nepal"))[0] == 405
+
+
+def test_responses_are_cached_per_kb_version(server):
+    target = "/recommendations?interest=nature&budget=low"
+    get(server, target)
+    get(server, "/recommendations?budget=low&interest=nature")
+    assert len(server.engine.calls) == 1
+    server.engine.kb_version = 2
+    get(server, target)
+    assert len(server.engine.calls) == 2
+    assert (server.cache_hits, server.cache_misses) == (1, 2)
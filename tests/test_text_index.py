@@ -0,0 +1,35 @@
+"""
+TextIndex, the inverted index behind visa document and season search.
+
+Usage: python -m pytest tests
+"""
+
+import pytest
+
+from main import Destination, TextIndex
+
+
+ROWS = [
+    Destination('maldives', 'visa_free', 'Valid passport, Return ticket, Hotel booking',
+                'November to April (Dry season)', 2000),
+    Destination('nepal', 'visa_on_arrival', 'Valid passport, 2 passport photos',
+                'September to November', 500),
+    Destination('turkey', 'e_visa', 'Passport, Hotel bookings, Bank statement',
+                'April-May, September-October', 1000),
+    Destination('uk', 'visa_required', 'Passport, Bank statements, Return tickets',
+                'Year-round', 2500),
+]
+
+
+def test_text_index_required_and_excluded_terms():
+    index = TextIndex(ROWS, version=1)
+    names = lambda mask: [row['destination'] for i, row in enumerate(index.rows) if mask >> i & 1]
+    # Plurals match their singular
+    assert names(index.mask('bank statement')) == ['turkey', 'uk']
+    assert names(index.mask('hotel -return')) == ['turkey']
+    assert names(index.mask('passport photo')) == ['nepal']
+    assert names(index.mask('november', fields=['season'])) == ['maldives', 'nepal']
+    assert names(index.mask('november', fields=['documents'])) == []
+    assert index.mask('') == index.all
+    with pytest.raises(ValueError):
+        index.mask('passport', fields=['visa'])
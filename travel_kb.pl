@@ -6,6 +6,17 @@
 % Scope: 5 destinations (Maldives, Nepal, Turkey, UK, Dubai)
 % ============================================================================
 
+% The fact tables are dynamic so the application can hot-reload edits to
+% this file with assert/retract instead of reconsulting it
+:- dynamic visa_status/2, budget_level/2, interest_match/2,
+           min_budget/2, visa_documents/2, best_season/2.
+
+% The rules are module-transparent: called as Origin:Goal they read the fact
+% tables of that origin's module, so one copy serves every origin (see
+% kb_support.pl)
+:- module_transparent can_visit/3, destination_info/7, visa_difficulty/2,
+                      in_budget_range/2.
+
 % ============================================================================
 % FACTS: VISA STATUS
 % ============================================================================